@@ -7,183 +7,346 @@ Wrapper class 'Benning_MM12_Serial' to communicate with the DMM Benning MM12
 """
 
 import serial
-import time
+import struct, threading, time
+import numpy as np
+
+# define a function to build the lookup table (function code, range code) -> (function, unit, multiplier)
+def _build_range_table(dict_function_codes_units, list_groups):
+    dict_range_table = {}
+    for tuple_func_codes, dict_range_multiplier in list_groups:
+        for func_code in tuple_func_codes:
+            for range_code, multiplier in dict_range_multiplier.items():
+                dict_range_table[(func_code, range_code)] = dict_function_codes_units[func_code] + (multiplier,)
+    return dict_range_table
+
+# define a function to build the lookup table scope code (byte) -> (unit, multiplier)
+def _build_scope_table(list_scope_unit, list_scope_multiplier):
+    list_scope_table = []
+    for code in range(256):
+        multiplier = list_scope_multiplier.get(code & 0b00000111, 0)
+        # no multiplier (None): the value is shown without decimal point
+        list_scope_table.append((list_scope_unit.get(code >> 3), 1 if multiplier is None else multiplier))
+    return tuple(list_scope_table)
+
+# define a function to build the lookup arrays of the vectorized decoding: multiplier per
+# [function code, range code] (NaN for unknown codes), multiplier and unit per scope code
+def _build_lookup_arrays(dict_range_table, list_scope_table):
+    array_range_multiplier = np.full((128, 128), np.nan)
+    for (func_code, range_code), entry in dict_range_table.items():
+        array_range_multiplier[func_code, range_code] = entry[2]
+
+    array_scope_multiplier = np.array([np.nan if unit is None or multiplier == 0 else multiplier
+                                       for unit, multiplier in list_scope_table])
+    array_scope_unit = np.array(['' if unit is None else unit for unit, _ in list_scope_table])
+    return array_range_multiplier, array_scope_multiplier, array_scope_unit
+
+class MM12_FrameParser():
+    """Incremental parser for the byte stream of the Benning MM12
+
+    Frames are '55 55 <command> <length> <payload (length bytes)> <checksum>', the checksum is the
+    sum of all preceding bytes of the frame (lowest byte). Chunks of any size are accepted by
+    'feed()', which returns the complete and valid frames; garbage and broken frames are skipped
+    by searching for the next header.
+    """
+
+    HEADER = b'\x55\x55'
+    MAX_PAYLOAD = 0x40 # longest payload: 52 bytes (device infos)
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.frames_ok = 0
+        self.checksum_errors = 0
+        self.bytes_discarded = 0
+
+    # function to drop all buffered bytes
+    def reset(self):
+        self.bytes_discarded += len(self._buffer)
+        self._buffer.clear()
+
+    # function to add received bytes and return the list of complete frames (as bytes)
+    def feed(self, data):
+        self._buffer += data
+        buffer = self._buffer
+        list_frames = []
+
+        while True:
+            idx = buffer.find(self.HEADER)
+            if idx < 0:
+                # keep a trailing 0x55, it may be the first byte of the next header
+                int_keep = 1 if buffer.endswith(b'\x55') else 0
+                self.bytes_discarded += len(buffer) - int_keep
+                del buffer[:len(buffer) - int_keep]
+                break
+
+            if idx > 0:
+                self.bytes_discarded += idx
+                del buffer[:idx]
+
+            if len(buffer) < 4:
+                break
+
+            int_payload = buffer[3]
+            if int_payload > self.MAX_PAYLOAD:
+                # no valid header: search again from the next byte
+                self.bytes_discarded += 1
+                del buffer[:1]
+                continue
+
+            int_frame = 4 + int_payload + 1
+            if len(buffer) < int_frame:
+                break
+
+            if sum(buffer[:int_frame - 1]) & 0xFF == buffer[int_frame - 1]:
+                list_frames.append(bytes(buffer[:int_frame]))
+                del buffer[:int_frame]
+                self.frames_ok += 1
+            else:
+                self.checksum_errors += 1
+                self.bytes_discarded += 1
+                del buffer[:1]
+
+        return list_frames
+
+####################################################
 
 class Benning_MM12_Serial():
+    # function codes of Benning MM12 (table 6 in communication datasheet)
+    # the codes 0x32 ... 0x3E have not been included at the moment, because they are rarely used
+    # dictionary holds measuring modes and the corresponding SI base units
+    dict_function_codes_units = {
+        0x00 : ('None', 'None'),
+        0x01 : ('AC V', 'V'),
+        0x02 : ('DC V', 'V'),
+        0x03 : ('AC mV', 'mV'),
+        0x04 : ('DC mV', 'mV'),
+        0x05 : ('Ohm', 'Ohm'),
+        0x06 : ('Continuity', 'Ohm'),
+        0x07 : ('Diode', 'V'),
+        0x08 : ('Capacitor', 'uF'),
+        0x09 : ('AC A', 'A'),
+        0x0A : ('DC A', 'A'),
+        0x0B : ('AC mA', 'mA'),
+        0x0C : ('DC mA', 'mA'),
+        0x0D : ('°C', '°C'),
+        0x0E : ('°F', '°F'),
+        0x0F : ('Frequency', 'Hz'),
+        0x10 : ('Duty', 'sec'),
+        0x11 : ('Hz (V)', 'Hz'),
+        0x12 : ('Hz (mV)', 'Hz'),
+        0x13 : ('Hz (A)', 'Hz'),
+        0x14 : ('Hz (mA)', 'Hz'),
+        0x15 : ('AC+DC (V)', 'V'),
+        0x16 : ('AC+DC (mV)', 'mV'),
+        0x17 : ('AC+DC (A)', 'A'),
+        0x18 : ('AC+DC (mA)', 'mA'),
+        0x19 : ('LPF (V)', 'V'),
+        0x1A : ('LPF (mV)', 'mV'),
+        0x1B : ('LPF (A)', 'A'),
+        0x1C : ('LPF (mA)', 'mA'),
+        0x1D : ('AC uA', 'uA'),
+        0x1E : ('DC uA', 'uA'),
+        0x1F : ('DC A out', 'A'),
+        0x20 : ('DC A out (Slow Linear)', 'A'),
+        0x21 : ('DC A out (Fast Linear)', 'A'),
+        0x22 : ('DC A out (Slow Step)', 'A'),
+        0x23 : ('DC A out (Fast Step)', 'A'),
+        0x24 : ('Loop Power', 'W'),
+        0x25 : ('250 Ohm HART', 'Ohm'),
+        0x26 : ('Voltage Sense', 'V'),
+        0x27 : ('Peak Hold (V)', 'V'),
+        0x28 : ('Peak Hold (mV)', 'mV'),
+        0x29 : ('Peak Hold (A)', 'A'),
+        0x2A : ('Peak Hold (mA)', 'mA'),
+        0x2B : ('LoZ AC V', 'V'),
+        0x2C : ('LoZ DC V', 'V'),
+        0x2D : ('LoZ AC+DC (V)', 'V'),
+        0x2E : ('LoZ LPF (V)', 'V'),
+        0x2F : ('LoZ Hz (V)', 'V'),
+        0x30 : ('LoZ Peak Hold (V)', 'V'),
+        0x31 : ('Battery', '%')
+    }
+    
+    # range codes of Benning MM12 (table 7.1 and 7.2 in communication datasheet)
+    list_range_multiplier_ohm = {
+        0x00 : 0.01,
+        0x01 : 0.1,
+        0x02 : 1,
+        0x03 : 10,
+        0x04 : 100,
+        0x05 : 1000
+    }
+
+    list_range_multiplier_temp = {
+        0x00 : 0.1
+    }
+
+    list_range_multiplier_voltage = {
+        0x00 : 0.0001,
+        0x01 : 0.001,
+        0x02 : 0.01,
+        0x03 : 0.1
+    }
+
+    # Attention: these hexadecimal values are actually implemented like this in the DMM firmware!
+    list_range_multiplier_LoZ_voltage = {
+        0x02 : 0.01,
+        0x03 : 0.1
+    }
+
+    list_range_multiplier_millivoltage = {
+        0x00 : 0.001,
+        0x01 : 0.01
+    }
+
+    # Attention: these hexadecimal values are actually implemented like this in the DMM firmware!
+    list_range_multiplier_current = {
+        0x02 : 0.0001,
+        0x03 : 0.001
+    }
+
+    list_range_multiplier_millicurrent = {
+        0x00 : 0.001,
+        0x01 : 0.01
+    }
+
+    list_range_multiplier_capacity = {
+        0x00 : 0.00001,
+        0x01 : 0.0001,
+        0x02 : 0.001,
+        0x03 : 0.01,
+        0x04 : 0.1,
+        0x05 : 1,
+        0x06 : 10
+    }
+
+    list_range_multiplier_frequency = {
+        0x00 : 0.01,
+        0x01 : 0.1,
+        0x02 : 1,
+        0x03 : 10
+    }
+
+    list_range_multiplier_continuity = {
+        0x00 : 0.01
+    }
+
+    list_range_multiplier_diode = {
+        0x00 : 0.001
+    }
+
+    list_range_multiplier_NONE = {
+        0x00 : 1
+    }
+    
+    # scope codes of Benning MM12 (table 2 in communication datasheet)
+    # bits 7..3 represent the unit
+    list_scope_unit = {
+        0x00 : 'None',
+        0x01 : 'V',
+        0x02 : 'mV',
+        0x03 : 'A',
+        0x04 : 'mA',
+        0x05 : 'dB',
+        0x06 : 'dBm',
+        0x07 : 'mF',
+        0x08 : 'uF',
+        0x09 : 'nF',
+        0x0A : 'GOhm',
+        0x0B : 'MOhm',
+        0x0C : 'kOhm',
+        0x0D : 'Ohm',
+        0x0E : '%',
+        0x0F : 'MHz',
+        0x10 : 'kHz',
+        0x11 : 'Hz',
+        0x12 : '°C',
+        0x13 : '°F',
+        0x14 : 'sec',
+        0x15 : 'ms',
+        0x16 : 'us',
+        0x17 : 'ns',
+        0x18 : 'uA',
+        0x19 : 'min',
+        0x1A : 'kW',
+        0x1B : 'PF'
+    }
+
+    # bits 2..0 represent the multiplier
+    list_scope_multiplier = {
+        0x00 : None,
+        0x01 : 0.1,
+        0x02 : 0.01,
+        0x03 : 0.001,
+        0x04 : 0.0001
+    }
+
+    # lookup tables built once for the class: (function code, range code) -> (function, unit, range multiplier)
+    # and scope code -> (unit, multiplier) (multiplier 0 marks an invalid code)
+    _RANGE_TABLE = _build_range_table(dict_function_codes_units, (
+        ((0x05,),                         list_range_multiplier_ohm),           # Ohm
+        ((0x0D, 0x0E),                    list_range_multiplier_temp),          # temperature (°C or °F)
+        ((0x01, 0x19, 0x27, 0x02, 0x15),  list_range_multiplier_voltage),       # AC V, LPF (V), Peak Hold (V), DC V, AC+DC (V)
+        ((0x03, 0x1A, 0x28, 0x04, 0x16),  list_range_multiplier_millivoltage),  # AC mV, LPF (mV), Peak Hold (mV), DC mV, AC+DC (mV)
+        ((0x2B, 0x2C),                    list_range_multiplier_LoZ_voltage),   # LoZ AC V, LoZ DC V
+        ((0x09, 0x0A, 0x17, 0x1B, 0x29),  list_range_multiplier_current),       # AC A, DC A, AC+DC (A), LPF (A), Peak Hold (A)
+        ((0x0B, 0x0C, 0x18, 0x1C, 0x2A),  list_range_multiplier_millicurrent),  # AC mA, DC mA, AC+DC (mA), LPF (mA), Peak Hold (mA)
+        ((0x08,),                         list_range_multiplier_capacity),      # capacitor (in µF)
+        ((0x11, 0x12, 0x13, 0x14),        list_range_multiplier_frequency),     # Hz (V), Hz (mV), Hz (A), Hz (mA)
+        ((0x06,),                         list_range_multiplier_continuity),    # continuity (Ohm)
+        ((0x07,),                         list_range_multiplier_diode),         # diode (V)
+        ((0x00,),                         list_range_multiplier_NONE)           # NONE
+    ))
+    _SCOPE_TABLE = _build_scope_table(list_scope_unit, list_scope_multiplier)
+    _RANGE_MULTIPLIERS, _SCOPE_MULTIPLIERS, _SCOPE_UNITS = _build_lookup_arrays(_RANGE_TABLE, _SCOPE_TABLE)
+
+    # commands as bytes and header of the display reply (0x55 0x55, command 0x01, 12 bytes payload)
+    _CMD_READ_INFOS = bytes.fromhex('55 55 00 00 AA')
+    _CMD_READ_DISPLAY = bytes.fromhex('55 55 01 00 AB')
+    _HEADER_DISPLAY = bytes.fromhex('55 55 01 0C')
+    _LEN_DISPLAY = 17
+
+    # display reply: header, function code, range code, measuring value (24 bit, little-endian:
+    # low word and high byte) and scope code (unpacked directly from the received buffer, no copy)
+    _STRUCT_DISPLAY = struct.Struct('<4sBBHBB')
+
+    # samples of the polling mode: monotonic timestamp [s], value in SI base units and function code
+    DTYPE_SAMPLE = np.dtype([('time', 'f8'), ('value', 'f8'), ('function', 'u1')])
+
+    # records of the capture files: timestamp (time.time()) and the raw display reply (17 bytes)
+    DTYPE_CAPTURE = np.dtype([('time', '<f8'), ('header', 'S4'), ('function', 'u1'), ('range', 'u1'),
+                              ('value_low', '<u2'), ('value_high', 'u1'), ('scope', 'u1'),
+                              ('reserved', 'V6'), ('checksum', 'u1')])
+
+    # decoded captures: function and range code without the MSBs, auto/manual flags, value in SI
+    # base units and displayed value with its unit (values of invalid frames or unknown codes are NaN)
+    DTYPE_DECODED = np.dtype([('time', 'f8'), ('function', 'u1'), ('range', 'u1'), ('auto_test', '?'),
+                              ('auto_range', '?'), ('value', 'f8'), ('display_value', 'f8'),
+                              ('display_unit', 'U4'), ('valid', '?')])
+
     def __init__(self, port):
         self._port = port
         self.MM12_READ_INFOS   = '55 55 00 00 AA'
         self.MM12_READ_DISPLAY = '55 55 01 00 AB'
-        
-        # function codes of Benning MM12 (table 6 in communication datasheet)
-        # the codes 0x32 ... 0x3E have not been included at the moment, because they are rarely used
-        # dictionary holds measuring modes and the corresponding SI base units
-        self.dict_function_codes_units = {
-            0x00 : ('None', 'None'),
-            0x01 : ('AC V', 'V'),
-            0x02 : ('DC V', 'V'),
-            0x03 : ('AC mV', 'mV'),
-            0x04 : ('DC mV', 'mV'),
-            0x05 : ('Ohm', 'Ohm'),
-            0x06 : ('Continuity', 'Ohm'),
-            0x07 : ('Diode', 'V'),
-            0x08 : ('Capacitor', 'uF'),
-            0x09 : ('AC A', 'A'),
-            0x0A : ('DC A', 'A'),
-            0x0B : ('AC mA', 'mA'),
-            0x0C : ('DC mA', 'mA'),
-            0x0D : ('°C', '°C'),
-            0x0E : ('°F', '°F'),
-            0x0F : ('Frequency', 'Hz'),
-            0x10 : ('Duty', 'sec'),
-            0x11 : ('Hz (V)', 'Hz'),
-            0x12 : ('Hz (mV)', 'Hz'),
-            0x13 : ('Hz (A)', 'Hz'),
-            0x14 : ('Hz (mA)', 'Hz'),
-            0x15 : ('AC+DC (V)', 'V'),
-            0x16 : ('AC+DC (mV)', 'mV'),
-            0x17 : ('AC+DC (A)', 'A'),
-            0x18 : ('AC+DC (mA)', 'mA'),
-            0x19 : ('LPF (V)', 'V'),
-            0x1A : ('LPF (mV)', 'mV'),
-            0x1B : ('LPF (A)', 'A'),
-            0x1C : ('LPF (mA)', 'mA'),
-            0x1D : ('AC uA', 'uA'),
-            0x1E : ('DC uA', 'uA'),
-            0x1F : ('DC A out', 'A'),
-            0x20 : ('DC A out (Slow Linear)', 'A'),
-            0x21 : ('DC A out (Fast Linear)', 'A'),
-            0x22 : ('DC A out (Slow Step)', 'A'),
-            0x23 : ('DC A out (Fast Step)', 'A'),
-            0x24 : ('Loop Power', 'W'),
-            0x25 : ('250 Ohm HART', 'Ohm'),
-            0x26 : ('Voltage Sense', 'V'),
-            0x27 : ('Peak Hold (V)', 'V'),
-            0x28 : ('Peak Hold (mV)', 'mV'),
-            0x29 : ('Peak Hold (A)', 'A'),
-            0x2A : ('Peak Hold (mA)', 'mA'),
-            0x2B : ('LoZ AC V', 'V'),
-            0x2C : ('LoZ DC V', 'V'),
-            0x2D : ('LoZ AC+DC (V)', 'V'),
-            0x2E : ('LoZ LPF (V)', 'V'),
-            0x2F : ('LoZ Hz (V)', 'V'),
-            0x30 : ('LoZ Peak Hold (V)', 'V'),
-            0x31 : ('Battery', '%')
-        }
-        
-        # range codes of Benning MM12 (table 7.1 and 7.2 in communication datasheet)
-        self.list_range_multiplier_ohm = {
-            0x00 : 0.01,
-            0x01 : 0.1,
-            0x02 : 1,
-            0x03 : 10,
-            0x04 : 100,
-            0x05 : 1000
-        }
-
-        self.list_range_multiplier_temp = {
-            0x00 : 0.1
-        }
-
-        self.list_range_multiplier_voltage = {
-            0x00 : 0.0001,
-            0x01 : 0.001,
-            0x02 : 0.01,
-            0x03 : 0.1
-        }
-
-        # Attention: these hexadecimal values are actually implemented like this in the DMM firmware!
-        self.list_range_multiplier_LoZ_voltage = {
-            0x02 : 0.01,
-            0x03 : 0.1
-        }
-
-        self.list_range_multiplier_millivoltage = {
-            0x00 : 0.001,
-            0x01 : 0.01
-        }
-
-        # Attention: these hexadecimal values are actually implemented like this in the DMM firmware!
-        self.list_range_multiplier_current = {
-            0x02 : 0.0001,
-            0x03 : 0.001
-        }
-
-        self.list_range_multiplier_millicurrent = {
-            0x00 : 0.001,
-            0x01 : 0.01
-        }
-
-        self.list_range_multiplier_capacity = {
-            0x00 : 0.00001,
-            0x01 : 0.0001,
-            0x02 : 0.001,
-            0x03 : 0.01,
-            0x04 : 0.1,
-            0x05 : 1,
-            0x06 : 10
-        }
-
-        self.list_range_multiplier_frequency = {
-            0x00 : 0.01,
-            0x01 : 0.1,
-            0x02 : 1,
-            0x03 : 10
-        }
-
-        self.list_range_multiplier_continuity = {
-            0x00 : 0.01
-        }
-
-        self.list_range_multiplier_diode = {
-            0x00 : 0.001
-        }
-
-        self.list_range_multiplier_NONE = {
-            0x00 : 1
-        }
-        
-        # scope codes of Benning MM12 (table 2 in communication datasheet)
-        # bits 7..3 represent the unit
-        self.list_scope_unit = {
-            0x00 : 'None',
-            0x01 : 'V',
-            0x02 : 'mV',
-            0x03 : 'A',
-            0x04 : 'mA',
-            0x05 : 'dB',
-            0x06 : 'dBm',
-            0x07 : 'mF',
-            0x08 : 'uF',
-            0x09 : 'nF',
-            0x0A : 'GOhm',
-            0x0B : 'MOhm',
-            0x0C : 'kOhm',
-            0x0D : 'Ohm',
-            0x0E : '%',
-            0x0F : 'MHz',
-            0x10 : 'kHz',
-            0x11 : 'Hz',
-            0x12 : '°C',
-            0x13 : '°F',
-            0x14 : 'sec',
-            0x15 : 'ms',
-            0x16 : 'us',
-            0x17 : 'ns',
-            0x18 : 'uA',
-            0x19 : 'min',
-            0x1A : 'kW',
-            0x1B : 'PF'
-        }
-
-        # bits 2..0 represent the multiplier
-        self.list_scope_multiplier = {
-            0x00 : None,
-            0x01 : 0.1,
-            0x02 : 0.01,
-            0x03 : 0.001,
-            0x04 : 0.0001
-        }
+
+        # parser of the received byte stream
+        self._parser = MM12_FrameParser()
+        # receive time of the last reply returned by '_readFrame()' (monotonic clock and wall clock)
+        self.frame_time = 0.0
+        self._frame_time_wall = 0.0
+
+        # polling mode: reader thread and ring buffer of the samples
+        self._poll_thread = None
+        self._poll_stop = threading.Event()
+        self._ring_lock = threading.Lock()
+        self._ring = np.zeros(0, dtype=self.DTYPE_SAMPLE)
+        self._ring_count = 0 # number of samples written since the start
+        self._ring_read = 0 # number of samples drained (or overwritten before)
+        self.ring_overruns = 0 # number of samples overwritten before they were drained
+
+        # capture mode: raw display replies are recorded to a binary file
+        self._capture_lock = threading.Lock()
+        self._capture_file = None
+        self.capture_count = 0
         
         try:
             if self._port == []:
@@ -222,6 +385,9 @@ class Benning_MM12_Serial():
 
     # define a CLOSE CONNECTION function
     def closeConnection(self):
+        self.stopPolling()
+        self.stopCapture()
+
         try:
             if self.status == "Connected":
                 self._serial.close()
@@ -280,23 +446,17 @@ class Benning_MM12_Serial():
     
     # define a function to retrieve the device infos and return a dictionary
     def getDeviceInfos(self):
-        # flush input buffer, discarding all its contents
-        self._serial.reset_input_buffer()
+        if self.isPolling():
+            print("Polling is running, use stopPolling() first")
+            return {}
 
-        # convert byte string of command to bytes
-        self.hex_bytes = self._func_convert_byteString_2_bytes(self.MM12_READ_INFOS)
-        self._serial.write(self.hex_bytes)
-        
         # read back the 57 byte response of the MM12
-        self.hex_string = self._serial.read(57)
+        self.hex_string = self._readFrame(self._CMD_READ_INFOS)
         self.hex_bytes = self.hex_string.hex()
         
         ###
         # test for valid response
-        self.cmd_response = self.hex_bytes[0:8]
-        self.cmd_response_int = int(self.cmd_response, 16)
-        
-        if self.cmd_response_int != 0x55550034:
+        if self.hex_bytes[0:8] != '55550034':
             print('Reading failed!')
             return {}
         
@@ -336,197 +496,302 @@ class Benning_MM12_Serial():
         
         return self.dict_dmm_infos
 
-    # define a function to retrieve the measurements converted in SI base units
-    def getMeasurement_baseUnits(self):
-        # flush input buffer, discarding all its contents
+    # define an internal function to send a command and read back its reply
+    # (returns the newest reply to this command: late replies to former requests are dropped,
+    # the receive time of the reply is kept in 'frame_time')
+    def _readFrame(self, cmd_bytes):
+        self._serial.write(cmd_bytes)
+
+        # read all bytes waiting (at least 1, blocking up to the serial timeout) until the reply arrives
+        frame_newest = None
+        time_deadline = time.monotonic() + self._serial.timeout
+        while time.monotonic() < time_deadline:
+            list_frames = self._parser.feed(self._serial.read(self._serial.in_waiting or 1))
+            time_rx, time_rx_wall = time.monotonic(), time.time()
+
+            for frame in list_frames:
+                # replies to other commands are skipped, older replies are replaced by newer ones
+                if frame[2] == cmd_bytes[2]:
+                    frame_newest = frame
+                    self.frame_time, self._frame_time_wall = time_rx, time_rx_wall
+
+            # return the reply, when all bytes received so far are parsed
+            if frame_newest is not None and not self._serial.in_waiting:
+                if self._capture_file is not None and len(frame_newest) == self._LEN_DISPLAY:
+                    self._captureFrame(frame_newest, self._frame_time_wall)
+                return frame_newest
+
+        # no reply: flush input buffer, discarding all its contents
         self._serial.reset_input_buffer()
-        
-        # convert byte string of command to bytes
-        self.hex_bytes = self._func_convert_byteString_2_bytes(self.MM12_READ_DISPLAY)
-        self._serial.write(self.hex_bytes)
-        
-        # read back the 17 byte response of the MM12
-        self.hex_string = self._serial.read(17)
-        self.hex_bytes = self.hex_string.hex()
-        
-        ###
-        # test for valid response
-        self.cmd_response = self.hex_bytes[0:8]
-        self.cmd_response_int = int(self.cmd_response, 16)
-        
-        if self.cmd_response_int != 0x5555010C:
-            print('Reading failed!')
+        self._parser.reset()
+        return b''
+
+    # define an internal function to decode a display reply (17 bytes) into the function code, the
+    # value in SI base units and the entry of the range table (returns None for invalid frames or unknown codes)
+    @classmethod
+    def _decodeBase(cls, frame):
+        if len(frame) < cls._LEN_DISPLAY:
+            return None
+
+        header, func_code, range_code, value_low, value_high, _ = cls._STRUCT_DISPLAY.unpack_from(frame)
+        if header != cls._HEADER_DISPLAY:
+            return None
+
+        # mask the MSBs that identify the auto or manual test and range
+        func_code &= 0b01111111
+        entry = cls._RANGE_TABLE.get((func_code, range_code & 0b01111111))
+        if entry is None:
+            return None
+
+        return func_code, (value_low | value_high << 16)*entry[2], entry
+
+    # define a function to decode a display reply (17 bytes) into the measurement in SI base units
+    # (returns an empty dictionary for invalid frames or unknown codes)
+    @classmethod
+    def decodeBaseUnits(cls, frame):
+        decoded = cls._decodeBase(frame)
+        if decoded is None:
             return {}
-        
-        self.dict_dmm_measurement = {}
-        
-        ###
-        # byte 0 from data payload is the function code
-        self.func_code = self.hex_bytes[8:10]
-        # convert from hex to int
-        self.func_code_int = int(self.func_code, 16)
 
-        # mask the MSB that identifies the auto or manual test
-        self.func_code_int = self._func_mask_MSB(self.func_code_int)
+        _, value, entry = decoded
+        return {'function': entry[0],
+                'value': value,
+                'unit': entry[1]}
 
-        self.list_func_unit = self.dict_function_codes_units[self.func_code_int]
-        
-        ###
-        # byte 1 from data payload is the range code
-        self.range_code = self.hex_bytes[10:12]
-        # convert from hex to int
-        self.range_code_int = int(self.range_code, 16)
-
-        # mask the MSB that identifies the auto or manual range
-        self.range_code_int = self._func_mask_MSB(self.range_code_int)
-
-        # function: Ohm
-        if self.func_code_int == 0x05:
-            self.range_float = self.list_range_multiplier_ohm[self.range_code_int]
-
-        # function: Temperature (°C or °F)
-        elif ( self.func_code_int == 0x0D or 
-                self.func_code_int == 0x0E ):
-            self.range_float = self.list_range_multiplier_temp[self.range_code_int]
-
-        # function: Voltage (AC V, LPF (V), Peak Hold (V), DC V, AC+DC (V))
-        elif ( self.func_code_int == 0x01 or
-                self.func_code_int == 0x19 or
-                self.func_code_int == 0x27 or
-                self.func_code_int == 0x02 or
-                self.func_code_int == 0x15 ):
-            self.range_float = self.list_range_multiplier_voltage[self.range_code_int]
-
-        # function: Millivoltage (AC mV, LPF (mV), Peak Hold (mV), DC mV, AC+DC (mV))
-        elif ( self.func_code_int == 0x03 or
-                self.func_code_int == 0x1A or
-                self.func_code_int == 0x28 or
-                self.func_code_int == 0x04 or
-                self.func_code_int == 0x16 ):
-            self.range_float = self.list_range_multiplier_millivoltage[self.range_code_int]
-
-        # function: LoZ Voltage (LoZ AC V, LoZ DC V)
-        elif ( self.func_code_int == 0x2B or
-                self.func_code_int == 0x2C ):
-            self.range_float = self.list_range_multiplier_LoZ_voltage[self.range_code_int]
-
-        # function: Current (AC A, DC A, AC+DC (A), LPF (A), Peak Hold (A))
-        elif ( self.func_code_int == 0x09 or
-                self.func_code_int == 0x0A or
-                self.func_code_int == 0x17 or
-                self.func_code_int == 0x1B or
-                self.func_code_int == 0x29 ):
-            self.range_float = self.list_range_multiplier_current[self.range_code_int]
-
-        # function: Millicurrent (AC mA, DC mA, AC+DC (mA), LPF (mA), Peak Hold (mA))
-        elif ( self.func_code_int == 0x0B or
-                self.func_code_int == 0x0C or
-                self.func_code_int == 0x18 or
-                self.func_code_int == 0x1C or
-                self.func_code_int == 0x2A ):
-            self.range_float = self.list_range_multiplier_millicurrent[self.range_code_int]
-
-        # function: Capacitor (in µF)
-        elif self.func_code_int == 0x08:
-            self.range_float = self.list_range_multiplier_capacity[self.range_code_int]
-
-        # function: Frequency (Hz (V), Hz (mV), Hz (A), Hz (mA))
-        elif ( self.func_code_int == 0x11 or
-                self.func_code_int == 0x12 or
-                self.func_code_int == 0x13 or
-                self.func_code_int == 0x14 ):
-            self.range_float = self.list_range_multiplier_frequency[self.range_code_int]
-
-        # function: Continuity (Ohm)
-        elif self.func_code_int == 0x06:
-            self.range_float = self.list_range_multiplier_continuity[self.range_code_int]
-
-        # function: Diode (V)
-        elif self.func_code_int == 0x07:
-            self.range_float = self.list_range_multiplier_continuity[self.range_code_int]
-
-        # function: NONE
-        elif self.func_code_int == 0x00:
-            self.range_float = self.list_range_multiplier_NONE[self.range_code_int]
-        
-        ###
-        # bytes 2..4 from data payload are the measuring value (24bit signed integer)
-        self.disp_value_hex = self.hex_bytes[12:18]
-        
-        self.disp_value_sint = self._func_convert_hex2int(self.disp_value_hex)
-        
-        self.dict_dmm_measurement['function'] = self.list_func_unit[0]
-        self.dict_dmm_measurement['value'] = self.disp_value_sint*self.range_float
-        self.dict_dmm_measurement['unit'] = self.list_func_unit[1]
-        
-        return self.dict_dmm_measurement
-    
-    # define a function to retrieve the measurements converted in human readable units
-    def getMeasurement_humanUnits(self):
-        # flush input buffer, discarding all its contents
-        self._serial.reset_input_buffer()
-
-        # convert byte string of command to bytes
-        self.hex_bytes = self._func_convert_byteString_2_bytes(self.MM12_READ_DISPLAY)
-        self._serial.write(self.hex_bytes)
-        
-        # read back the 17 byte response of the MM12
-        self.hex_string = self._serial.read(17)
-        self.hex_bytes = self.hex_string.hex()
-        
-        ###
-        # test for valid response
-        self.cmd_response = self.hex_bytes[0:8]
-        self.cmd_response_int = int(self.cmd_response, 16)
-        
-        if self.cmd_response_int != 0x5555010C:
-            print('Reading failed!')
+    # define a function to decode a display reply (17 bytes) into the measurement in human readable units
+    # (returns an empty dictionary for invalid frames or unknown codes)
+    @classmethod
+    def decodeHumanUnits(cls, frame):
+        if len(frame) < cls._LEN_DISPLAY:
             return {}
-        
-        self.dict_dmm_measurement = {}
-        
-        ###
-        # bytes 2..4 from data payload are the measuring value (24bit signed integer)
-        self.disp_value_hex = self.hex_bytes[12:18]
-        
-        self.disp_value_sint = self._func_convert_hex2int(self.disp_value_hex)
-        
-        ###
-        # byte 5 from data payload represent the scope code
-        self.scope_code_hex = self.hex_bytes[18:20]
-        # convert from hex to int
-        self.scope_code_int = int(self.scope_code_hex, 16)
 
-        ###
-        # byte 5, bits 7..3 represent the unit
-        self.unit_code = self.scope_code_int >> 3
-        self.unit_str = self.list_scope_unit[self.unit_code]
+        header, _, _, value_low, value_high, scope_code = cls._STRUCT_DISPLAY.unpack_from(frame)
+        if header != cls._HEADER_DISPLAY:
+            return {}
 
-        ###
-        # byte 5, bits 2..0 represent the multiplier
-        self.multiplier_code = self.scope_code_int & 0b00000111
-        self.multiplier_float = self.list_scope_multiplier[self.multiplier_code]
-        
-        self.dict_dmm_measurement['value'] = self.disp_value_sint*self.multiplier_float
-        self.dict_dmm_measurement['unit'] = self.unit_str
-        
-        return self.dict_dmm_measurement
+        # byte 5 of the payload: bits 7..3 represent the unit, bits 2..0 the multiplier
+        unit_str, multiplier_float = cls._SCOPE_TABLE[scope_code]
+        if unit_str is None or multiplier_float == 0:
+            return {}
 
+        return {'value': (value_low | value_high << 16)*multiplier_float,
+                'unit': unit_str}
 
+    # define a function to decode a display reply (17 bytes) completely: function, range, scope unit,
+    # multipliers and the auto/manual flags together with the value in SI base and in human readable units
+    # (returns an empty dictionary for invalid frames or unknown codes)
+    @classmethod
+    def decodeFrame(cls, frame):
+        if len(frame) < cls._LEN_DISPLAY:
+            return {}
 
+        header, func_byte, range_byte, value_low, value_high, scope_code = cls._STRUCT_DISPLAY.unpack_from(frame)
+        if header != cls._HEADER_DISPLAY:
+            return {}
 
+        # the MSBs identify the auto or manual test and range
+        func_code = func_byte & 0b01111111
+        range_code = range_byte & 0b01111111
+        entry = cls._RANGE_TABLE.get((func_code, range_code))
+        if entry is None:
+            return {}
 
+        value_raw = value_low | value_high << 16
+        display_unit, display_multiplier = cls._SCOPE_TABLE[scope_code]
+        return {'function': entry[0],
+                'function_code': func_code,
+                'range_code': range_code,
+                'auto_test': bool(func_byte & 0b10000000),
+                'auto_range': bool(range_byte & 0b10000000),
+                'value_raw': value_raw,
+                'multiplier': entry[2],
+                'value': value_raw*entry[2],
+                'unit': entry[1],
+                'display_multiplier': display_multiplier,
+                'display_value': value_raw*display_multiplier if display_unit is not None else None,
+                'display_unit': display_unit}
+
+    # define a function to decode a capture file (see 'startCapture()') at once into a numpy
+    # structured array (dtype 'DTYPE_DECODED')
+    @classmethod
+    def decodeCapture(cls, path):
+        array_capture = np.fromfile(path, dtype=cls.DTYPE_CAPTURE)
+        array_bytes = array_capture.view(np.uint8).reshape(len(array_capture), cls.DTYPE_CAPTURE.itemsize)
+
+        # checksum: sum of all bytes of the reply before the checksum (lowest byte)
+        offset_frame = cls.DTYPE_CAPTURE.fields['header'][1]
+        array_checksum = array_bytes[:, offset_frame:-1].sum(axis=1, dtype=np.uint32) & 0xFF
+
+        array_decoded = np.zeros(len(array_capture), dtype=cls.DTYPE_DECODED)
+        array_decoded['time'] = array_capture['time']
+        array_decoded['function'] = array_capture['function'] & 0b01111111
+        array_decoded['range'] = array_capture['range'] & 0b01111111
+        array_decoded['auto_test'] = array_capture['function'] & 0b10000000 != 0
+        array_decoded['auto_range'] = array_capture['range'] & 0b10000000 != 0
+
+        array_raw = array_capture['value_low'] | array_capture['value_high'].astype(np.uint32) << 16
+        array_multiplier = cls._RANGE_MULTIPLIERS[array_decoded['function'], array_decoded['range']]
+        array_valid = ((array_capture['header'] == cls._HEADER_DISPLAY) & (array_checksum == array_capture['checksum'])
+                       & ~np.isnan(array_multiplier))
+
+        array_decoded['value'] = np.where(array_valid, array_raw*array_multiplier, np.nan)
+        array_decoded['display_value'] = np.where(array_valid, array_raw*cls._SCOPE_MULTIPLIERS[array_capture['scope']], np.nan)
+        array_decoded['display_unit'] = cls._SCOPE_UNITS[array_capture['scope']]
+        array_decoded['valid'] = array_valid
+        return array_decoded
 
+    # define a function to retrieve the measurements converted in SI base units
+    def getMeasurement_baseUnits(self):
+        if self.isPolling():
+            print("Polling is running, use getLatest() or drainSamples()")
+            return {}
 
+        self.frame = self._readFrame(self._CMD_READ_DISPLAY)
 
+        self.dict_dmm_measurement = self.decodeBaseUnits(self.frame)
+        if not self.dict_dmm_measurement:
+            print('Reading failed!')
 
+        return self.dict_dmm_measurement
+    
+    # define a function to retrieve the measurements converted in human readable units
+    def getMeasurement_humanUnits(self):
+        if self.isPolling():
+            print("Polling is running, use getLatest() or drainSamples()")
+            return {}
 
+        self.frame = self._readFrame(self._CMD_READ_DISPLAY)
 
+        self.dict_dmm_measurement = self.decodeHumanUnits(self.frame)
+        if not self.dict_dmm_measurement:
+            print('Reading failed!')
 
+        return self.dict_dmm_measurement
 
+    # define a function to retrieve the complete decoded display reply (see 'decodeFrame()') with one request
+    def getMeasurement_full(self):
+        if self.isPolling():
+            print("Polling is running, use getLatest() or drainSamples()")
+            return {}
 
+        self.frame = self._readFrame(self._CMD_READ_DISPLAY)
 
+        self.dict_dmm_measurement = self.decodeFrame(self.frame)
+        if not self.dict_dmm_measurement:
+            print('Reading failed!')
 
+        return self.dict_dmm_measurement
 
+    # define an internal function to record a display reply to the capture file
+    def _captureFrame(self, frame, time_rx_wall):
+        with self._capture_lock:
+            if self._capture_file is None:
+                return
+            self._capture_file.write(struct.pack('<d', time_rx_wall) + frame)
+            self.capture_count += 1
 
+    # define a START CAPTURE function: all display replies (of single readings and of the polling
+    # mode) are recorded with their timestamp to the binary file 'path' (decode with 'decodeCapture()')
+    def startCapture(self, path, bool_append=False):
+        self.stopCapture()
 
+        try:
+            with self._capture_lock:
+                self._capture_file = open(path, 'ab' if bool_append else 'wb')
+                self.capture_count = 0
+        except OSError as ex:
+            print("Opening the capture file raised the error: '{}'".format(ex))
+            return -1
+        return 0
+
+    # define a STOP CAPTURE function: returns the number of recorded replies
+    def stopCapture(self):
+        with self._capture_lock:
+            if self._capture_file is not None:
+                self._capture_file.close()
+                self._capture_file = None
+        return self.capture_count
+
+    # define an internal function of the reader thread: polls the display continuously and writes
+    # the timestamped samples into the ring buffer
+    def _pollDisplay(self):
+        while not self._poll_stop.is_set():
+            try:
+                frame = self._readFrame(self._CMD_READ_DISPLAY)
+            except Exception as ex:
+                print("Polling the device raised the error: '{}'".format(ex))
+                break
+
+            # the sample is timestamped with the receive time of the reply
+            time_sample = self.frame_time
+            decoded = self._decodeBase(frame)
+            if decoded is None:
+                continue
+
+            with self._ring_lock:
+                self._ring[self._ring_count % len(self._ring)] = (time_sample, decoded[1], decoded[0])
+                self._ring_count += 1
+                # ring buffer is full: the oldest sample has been overwritten
+                if self._ring_count - self._ring_read > len(self._ring):
+                    self._ring_read += 1
+                    self.ring_overruns += 1
+
+    # define a START POLLING function: a reader thread polls the display continuously, the samples
+    # are kept in a ring buffer of 'int_buffer_size' samples (the oldest ones are overwritten)
+    def startPolling(self, int_buffer_size=10000):
+        if int_buffer_size < 1:
+            raise ValueError("Buffer size {} is NOT a valid one (>= 1)".format(int_buffer_size))
+
+        if self.status != "Connected":
+            print("Device is not connected")
+            return -1
+
+        if self.isPolling():
+            print("Polling is already running")
+            return -1
+
+        with self._ring_lock:
+            self._ring = np.zeros(int_buffer_size, dtype=self.DTYPE_SAMPLE)
+            self._ring_count = 0
+            self._ring_read = 0
+            self.ring_overruns = 0
+
+        self._poll_stop.clear()
+        self._poll_thread = threading.Thread(target=self._pollDisplay, name='Benning_MM12_poll', daemon=True)
+        self._poll_thread.start()
+        return 0
+
+    # define a STOP POLLING function (the samples not drained yet are kept)
+    def stopPolling(self):
+        if self._poll_thread is None:
+            return
+
+        self._poll_stop.set()
+        self._poll_thread.join()
+        self._poll_thread = None
+
+    # define a function to check, if the polling mode is running
+    def isPolling(self):
+        return self._poll_thread is not None and self._poll_thread.is_alive()
+
+    # define a GET LATEST function: the newest sample as dictionary (without removing it from the
+    # ring buffer) or an empty dictionary, if there is no sample yet
+    def getLatest(self):
+        with self._ring_lock:
+            if self._ring_count == 0:
+                return {}
+            sample = self._ring[(self._ring_count - 1) % len(self._ring)]
+
+        func_name, unit = self.dict_function_codes_units[int(sample['function'])]
+        return {'time': float(sample['time']), 'function': func_name, 'value': float(sample['value']), 'unit': unit}
+
+    # define a DRAIN SAMPLES function: removes all new samples from the ring buffer and returns them
+    # as numpy structured array (dtype 'DTYPE_SAMPLE', oldest sample first)
+    def drainSamples(self):
+        with self._ring_lock:
+            int_new = self._ring_count - self._ring_read
+            array_idx = np.arange(self._ring_read, self._ring_count) % max(1, len(self._ring))
+            array_samples = self._ring[array_idx] if int_new > 0 else np.zeros(0, dtype=self.DTYPE_SAMPLE)
+            self._ring_read = self._ring_count
+
+        return array_samples
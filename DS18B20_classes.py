@@ -7,13 +7,33 @@ Wrapper classes 'DS18B20_over_USB' and 'DS18B20_over_GPIO' to communicate with t
 """
 
 import hid # from packet 'hidapi'
-import time, os, subprocess
-import pandas as pd
+import time, os, subprocess, threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from SampleBuffer_class import SampleBuffer
 
 class DS18B20_over_USB():
+    # latest values of the reader thread: timestamp (time.time()) of the report, temperature,
+    # number of the sensor and its ID
+    DTYPE_TEMPERATURE = np.dtype([('time', 'f8'), ('temperature', 'f8'), ('sensor', 'u1'), ('sensor_id', 'U23')])
+
+    # timeout of a blocking read of the reader thread (to check for the stop request)
+    _READ_TIMEOUT_MS = 200
+
     def __init__(self, vid, pid):
         self._vid = vid
         self._pid = pid
+
+        # sensor ID strings per 8 ID bytes (built only once per sensor)
+        self._dict_id_strings = {}
+
+        # reader thread and table of the latest value per sensor
+        self._reader_thread = None
+        self._reader_stop = threading.Event()
+        self._latest_lock = threading.Lock()
+        self._latest = np.zeros(0, dtype=self.DTYPE_TEMPERATURE)
+        self.reports_cnt = 0
         
         try:
             if self._vid == [] or self._pid == []:
@@ -56,6 +76,8 @@ class DS18B20_over_USB():
 
     # define a CLOSE CONNECTION function
     def closeConnection(self):
+        self.stopReader()
+
         try:
             if self.status == "Connected":
                 self._h.close()
@@ -66,8 +88,21 @@ class DS18B20_over_USB():
             self.status = "Error"
             print("Disconnecting from the device raised the error: '{}'".format(ex))
 
+    # define an internal function to get the sensor ID string (bytes 8 to 16 of a report)
+    def _sensorID(self, byte_list):
+        id_bytes = bytes(byte_list[8:16])
+        sensor_id = self._dict_id_strings.get(id_bytes)
+        if sensor_id is None:
+            sensor_id = self._dict_id_strings[id_bytes] = ' '.join('{:02x}'.format(byte) for byte in id_bytes)
+        return sensor_id
+
     # define a GET SENSOR IDs function (detect the connected sensor(s))
     def getSensorIDs(self):
+        # the reader thread owns the HID device: take the IDs from the table of latest values
+        if self.isReading():
+            with self._latest_lock:
+                return [str(sensor_id) for sensor_id in self._latest['sensor_id'] if sensor_id]
+
         self.byte_list = self._h.read(64)
 
         # how many sensors do we have?
@@ -81,20 +116,23 @@ class DS18B20_over_USB():
             self.byte_list = self._h.read(64)
             self.sensor_number = self.byte_list[1]
             
-            self.sensor_id = ''
             # get sensor ID with the bytes 8 to 16 from character buffer
-            for self.j in range(8, 16, 1):
-                # convert integer from byte list to string with padding
-                self.hex_string = '{:02x}'.format(self.byte_list[self.j])
-                self.sensor_id = self.sensor_id + self.hex_string + ' '
-            
-            self.sensor_id = self.sensor_id.rstrip(None) # remove trailing whitespace from sensor id
+            self.sensor_id = self._sensorID(self.byte_list)
             self.sensor_ids_array.append(self.sensor_id)
             
         return self.sensor_ids_array
     
     # define a GET TEMPERATURE function for reading the values from all sensors to a dataframe
     def getTemperature_df(self):
+        # the reader thread is running: build the dataframe from the latest values (no waiting)
+        if self.isReading():
+            array_latest = self.getTemperatures()
+            self._temp_buffer = SampleBuffer(['timecode', 'temperature', 'sensor ID'], [object, float, object], int_capacity=len(array_latest))
+            for sample in array_latest:
+                self._temp_buffer.add_row([time.strftime('%H:%M:%S', time.localtime(sample['time'])), float(sample['temperature']), str(sample['sensor_id'])])
+            self.temp_df = self._temp_buffer.to_dataframe()
+            return self.temp_df
+
         # IMPORTANT:
         # wait some time between reading, so that the read buffer of the HID device
         # is not drained too fast => this leads to unsteady read intervals
@@ -106,50 +144,103 @@ class DS18B20_over_USB():
         # how many sensors do we have?
         self.sensors_cnt = self.byte_list[0]
         
-        # initialize the dataframe
-        self.temp_df = pd.DataFrame(columns=['timecode', 'temperature', 'sensor ID'])
+        # initialize the buffer for the rows of the dataframe
+        self._temp_buffer = SampleBuffer(['timecode', 'temperature', 'sensor ID'], [object, float, object], int_capacity=self.sensors_cnt)
         
         for self.i in range(1, self.sensors_cnt+1, 1):
-            self.sensor_id = ''
             # get sensor ID with the bytes 8 to 16 from character buffer
-            for self.j in range(8, 16, 1):
-                # convert integer from byte list to string with padding
-                self.hex_string = '{:02x}'.format(self.byte_list[self.j])
-                self.sensor_id = self.sensor_id + self.hex_string + ' '
-            
-            self.sensor_id = self.sensor_id.rstrip(None) # remove trailing whitespace from sensor id
+            self.sensor_id = self._sensorID(self.byte_list)
             
             # combine high and low byte of temperature value and convert to float
             self.temp = float(self.byte_list[5] << 8 | self.byte_list[4]) / 10
             
-            # add values in a row to temperature dataframe
-            self._dataframe_add_row(self.temp_df, [time.strftime('%H:%M:%S'), self.temp, self.sensor_id])
+            # add values in a row to temperature buffer
+            self._temp_buffer.add_row([time.strftime('%H:%M:%S'), self.temp, self.sensor_id])
             
             # read in next dataset only if needed
             if self.i <= self.sensors_cnt:
                 self.byte_list = self._h.read(64)
             
             time.sleep(self._READ_DELAY)
-            
-        return self.temp_df
-    
-    # helper function for adding rows to dataframes
-    def _dataframe_add_row(self, df=None, row=[]):
-        if (df is None):
-            return
         
-        # Add a row
-        df.loc[-1] = row
+        self.temp_df = self._temp_buffer.to_dataframe()
         
-        # Shift the index
-        df.index = df.index + 1
-        
-        # Reset the index of dataframe and avoid the old index being added as a column
-        df.reset_index(drop=True, inplace=True)
+        return self.temp_df
+
+    # define an internal function of the reader thread: drains the HID reports continuously and
+    # keeps the latest temperature of every sensor
+    def _readReports(self):
+        while not self._reader_stop.is_set():
+            try:
+                byte_list = self._h.read(64, self._READ_TIMEOUT_MS)
+            except Exception as ex:
+                print("Reading from the device raised the error: '{}'".format(ex))
+                break
+
+            # timeout (empty report) or incomplete report
+            if len(byte_list) < 16 or byte_list[0] == 0:
+                continue
+
+            time_report = time.time()
+            sensors_cnt, sensor_number = byte_list[0], byte_list[1]
+            # combine high and low byte of temperature value and convert to float
+            temp = float(byte_list[5] << 8 | byte_list[4]) / 10
+            sensor_id = self._sensorID(byte_list)
+
+            with self._latest_lock:
+                # number of sensors has changed: start with a new table
+                if len(self._latest) != sensors_cnt:
+                    self._latest = np.zeros(sensors_cnt, dtype=self.DTYPE_TEMPERATURE)
+                # the sensors are numbered from 1
+                if 1 <= sensor_number <= sensors_cnt:
+                    self._latest[sensor_number - 1] = (time_report, temp, sensor_number, sensor_id)
+                self.reports_cnt += 1
+
+    # define a START READER function: a reader thread drains the HID reports continuously
+    def startReader(self):
+        if self.status != "Connected":
+            print("Device is not connected")
+            return -1
+
+        if self.isReading():
+            print("Reader is already running")
+            return -1
+
+        with self._latest_lock:
+            self._latest = np.zeros(0, dtype=self.DTYPE_TEMPERATURE)
+            self.reports_cnt = 0
+
+        self._reader_stop.clear()
+        self._reader_thread = threading.Thread(target=self._readReports, name='DS18B20_over_USB_reader', daemon=True)
+        self._reader_thread.start()
+        return 0
+
+    # define a STOP READER function
+    def stopReader(self):
+        if self._reader_thread is None:
+            return
+
+        self._reader_stop.set()
+        self._reader_thread.join()
+        self._reader_thread = None
+
+    # define a function to check, if the reader thread is running
+    def isReading(self):
+        return self._reader_thread is not None and self._reader_thread.is_alive()
+
+    # define a GET TEMPERATURES function: the latest value of every sensor (already received) as numpy
+    # structured array (dtype 'DTYPE_TEMPERATURE', ordered by sensor number), returns without waiting
+    def getTemperatures(self):
+        with self._latest_lock:
+            return self._latest[self._latest['sensor'] > 0].copy()
 
 ####################################################
 
 class DS18B20_over_GPIO():    
+    # max. time of a conversion (12 bit: 750 ms) with some reserve and poll interval of the bulk read
+    _CONVERSION_TIMEOUT = 1.5
+    _BULK_POLL_INTERVAL = 0.02
+
     def __init__(self):
         # initialize internal variables
         self._sensor_device_path = '/sys/bus/w1/devices/'
@@ -210,4 +301,60 @@ class DS18B20_over_GPIO():
         self._command_str = 'sudo sh -c "echo {:d} > {:s}"'.format(resolution, self._file_path)
         self._ret = subprocess.run([self._command_str], shell=True)
 
-        return self._ret
\ No newline at end of file
+        return self._ret
+
+    # define an internal function to start a simultaneous conversion of all sensors on all w1 bus masters
+    # (bulk read interface of the kernel driver 'w1_therm'), returns the list of triggered bus masters
+    def _triggerBulkConversion(self):
+        list_masters = []
+        for obj in os.scandir(self._sensor_device_path):
+            if not obj.name.startswith('w1_bus_master') or not os.path.exists(obj.path + '/therm_bulk_read'):
+                continue
+            try:
+                with open(obj.path + '/therm_bulk_read', 'w') as file_handle:
+                    file_handle.write('trigger\n')
+                list_masters.append(obj.path)
+            except OSError:
+                pass
+        return list_masters
+
+    # define an internal function to wait until the bulk conversion of all bus masters is finished
+    # ('therm_bulk_read' reads -1 while a conversion is in progress)
+    def _waitBulkConversion(self, list_masters):
+        time_deadline = time.monotonic() + self._CONVERSION_TIMEOUT
+        for master_path in list_masters:
+            while time.monotonic() < time_deadline:
+                with open(master_path + '/therm_bulk_read') as file_handle:
+                    if file_handle.read().strip() != '-1':
+                        break
+                time.sleep(self._BULK_POLL_INTERVAL)
+
+    # define a GET TEMPERATURES ALL function: reads all sensors with one conversion time and returns a
+    # dictionary {sensor ID: temperature} (the temperature is None, if a sensor could not be read)
+    def getTemperaturesAll(self):
+        list_sensor_ids = self.getSensorIDs()
+        if not list_sensor_ids:
+            return {}
+
+        try:
+            list_masters = self._triggerBulkConversion()
+            if list_masters:
+                self._waitBulkConversion(list_masters)
+                # the conversion is finished: reading the temperatures returns at once
+                return {sensor_id: self.getTemperatureByID(sensor_id) for sensor_id in list_sensor_ids}
+        except OSError as ex:
+            print('Bulk reading from the DS18B20 sensors raised the error: "{}"'.format(ex))
+
+        # no bulk read interface (old kernel or missing write permission): every sensor converts
+        # in its own thread, so all conversions run in parallel
+        with ThreadPoolExecutor(max_workers=len(list_sensor_ids)) as executor:
+            return dict(zip(list_sensor_ids, executor.map(self._readTemperature, list_sensor_ids)))
+
+    # define an internal function to read the temperature of a sensor (thread-safe, without internal variables)
+    def _readTemperature(self, sensor_id):
+        try:
+            with open(self._sensor_device_path + sensor_id + '/temperature') as file_handle:
+                return float(file_handle.read()) / 1000
+
+        except Exception as ex:
+            print('Reading from the DS18B20 sensors raised the error: "{}"'.format(ex))
@@ -5,16 +5,22 @@ Created on Sat 04. June CET 2022
 @author: Bjoern Kasper (urmel79)
 Wrapper class to communicate with the DMM Fluke 8846A via LAN interface and SCPI commands using TCP sockets
 """
-import socket
+import select, socket
 import time, sys
 
+from SCPI_IOStats_class import SCPI_IOStats
+
 class Fluke_8846A():
-    def __init__(self, tcp_ip, tcp_port):
+    def __init__(self, tcp_ip, tcp_port, io_stats=False):
         self._ip = tcp_ip
         self._port = tcp_port
-        self._delay = 0.005 # delay for writing the commands in seconds (5 ms)
-        self._bytes2read = 40
-        self._sock_timeout = 0.1 # timeout for reading TCP sockets in [s]
+        # optional I/O statistics per SCPI command mnemonic
+        self._io_stats = SCPI_IOStats() if io_stats else None
+        self._bytes2read = 4096 # max. number of bytes per socket read
+        self._sock_timeout = 0.1 # timeout for blocking TCP socket operations (connect, send) in [s]
+        self._read_timeout = 3.0 # timeout for waiting for a complete reply in [s]
+        self._terminator = b'\n' # replies of the DMM are terminated by a newline
+        self._rx_buffer = bytearray() # received bytes not yet returned (start of the next reply)
         self._measurement_configuration = ''
         self._measurement_configured = False
         
@@ -41,6 +47,9 @@ class Fluke_8846A():
                 self.dmm_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 self.dmm_sock.connect((self._ip, self._port))
                 
+                # send short commands immediately (no Nagle delay waiting for the ACK of the former command)
+                self.dmm_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
                 # set timeout on blocking socket operations in [s]
                 self.dmm_sock.settimeout(self._sock_timeout)
             
@@ -55,53 +64,91 @@ class Fluke_8846A():
             self.connected_with = 'Nothing'
             print("Something's went wrong while opening %s:%d. Exception is %s" % (self._ip, self._port, e))
     
-    # define an internal CLEAR INPUT BUFFER function
+    # define an internal SEND function (records the I/O statistics, if enabled)
+    def _send(self, cmd):
+        if self._io_stats is None:
+            self.dmm_sock.sendall(cmd.encode('utf-8'))
+            return
+
+        self._io_stats.begin(cmd, len(cmd))
+        try:
+            self.dmm_sock.sendall(cmd.encode('utf-8'))
+        except Exception:
+            # record the failed transfer before passing on the error
+            self._io_stats.abort()
+            raise
+        # for queries the transfer ends when the answer has been read
+        if '?' not in cmd:
+            self._io_stats.end()
+
+    # define an internal function to record a query without (complete) reply as failed transfer
+    def _abortIOStats(self):
+        if self._io_stats is not None:
+            self._io_stats.abort()
+
+    # define an internal CLEAR INPUT BUFFER function: drops stale bytes without waiting
+    # (returns the number of discarded bytes)
     def _clearInputBuffer(self):
+        # drop the bytes left over from former replies
+        int_discarded = len(self._rx_buffer)
+        self._rx_buffer.clear()
+
         try:
-            # read answer with buffer size of 40 bytes and drop it
-            while self.dmm_sock.recv(self._bytes2read):
-                #time.sleep(self._delay)
-                pass
-        except:
-            pass
-
-    # define an internal READ SOCKET function
-    def _readSocket(self, int_bytes):
-        self.dmm_sock.settimeout(0.01)
-        
-        # define a knock out counter to break while loop
-        self.knock_out_counter = 10
-
-        while self.knock_out_counter >= 0:
-            # decrease knock out counter
-            self.knock_out_counter -= 1
-            #print("Knock out counter: {}".format(self.knock_out_counter)) # output only for debugging
-            
+            # read what is pending right now (zero timeout) and drop it
+            while select.select([self.dmm_sock], [], [], 0)[0]:
+                data = self.dmm_sock.recv(self._bytes2read)
+                if not data:
+                    break
+                int_discarded += len(data)
+        except (socket.timeout, socket.error, ValueError) as e:
+            print(e)
+
+        return int_discarded
+
+    # define an internal READ LINE function: returns the next reply (without terminator) as bytes or None,
+    # if no complete reply has arrived within the timeout (waits with 'select' until a complete line
+    # has arrived, bytes of the following reply are kept)
+    def _readLine(self, timeout=None):
+        if timeout is None:
+            timeout = self._read_timeout
+        time_deadline = time.monotonic() + timeout
+
+        while True:
+            # complete line in the buffer?
+            idx = self._rx_buffer.find(self._terminator)
+            if idx >= 0:
+                self.ret_val = bytes(self._rx_buffer[:idx])
+                del self._rx_buffer[:idx + len(self._terminator)]
+
+                if self._io_stats is not None:
+                    self._io_stats.end(idx + len(self._terminator))
+                return self.ret_val
+
+            time_remaining = time_deadline - time.monotonic()
+            if time_remaining <= 0:
+                print('timed out after {:.3f} s while waiting for the reply'.format(timeout))
+                self._abortIOStats()
+                return None
+
             try:
-                self.ret_val = self.dmm_sock.recv(int_bytes)
-            except socket.timeout as e:
-                self._err = e.args[0]
-                # this next if/else is a bit redundant, but illustrates how the
-                # timeout exception is setup
-                if self._err == 'timed out':
-                    time.sleep(0.3)
-                    #print('recv() timed out, retry later') # output only for debugging
+                list_readable, _, _ = select.select([self.dmm_sock], [], [], time_remaining)
+                if not list_readable:
                     continue
-                else:
-                    print(e)
-                    return -1
-            except socket.error as e:
+
+                data = self.dmm_sock.recv(self._bytes2read)
+            except (socket.timeout, socket.error) as e:
                 # Something else happened, handle error, exit funktion, etc.
                 print(e)
-                return -1
-            else:
-                if len(self.ret_val) == 0:
-                    print('orderly shutdown on server end')
-                    return -1
-                else:
-                    # got a message: return it :)
-                    return self.ret_val
-    
+                self._abortIOStats()
+                return None
+
+            if len(data) == 0:
+                print('orderly shutdown on server end')
+                self._abortIOStats()
+                return None
+
+            self._rx_buffer += data
+
     # define a OPEN CONNECTION function
     def openConnection(self, tcp_ip, tcp_port):
         try:
@@ -111,7 +158,11 @@ class Fluke_8846A():
                 else:
                     self.dmm_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                     self.dmm_sock.connect((tcp_ip, tcp_port))
+                    self._rx_buffer.clear()
                     
+                    # send short commands immediately (no Nagle delay waiting for the ACK of the former command)
+                    self.dmm_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
                     # set timeout on blocking socket operations in [s]
                     self.dmm_sock.settimeout(self._sock_timeout)
 
@@ -150,11 +201,12 @@ class Fluke_8846A():
         
         # get current measurement configuration
         self.cmd = '*IDN?\n'
-        self.dmm_sock.sendall(self.cmd.encode('utf-8'))
-        time.sleep(self._delay)
+        self._send(self.cmd)
         
-        # read answer with buffer size of 64 bytes
-        self.ret_val = self._readSocket(int_bytes=self._bytes2read)
+        # read answer (one line)
+        self.ret_val = self._readLine()
+        if self.ret_val is None:
+            return -1
 
         # strip whitespaces and newline characters from string
         self.ret_val = self.ret_val.decode().strip()
@@ -177,19 +229,23 @@ class Fluke_8846A():
             self._measurement_configured = False
             raise TypeError("Configuration {} is NOT a valid one".format(self._measurement_configuration))
             
-        # reset device
+        # reset device and wait until the reset is completed
         self.cmd = '*RST\n'
-        self.dmm_sock.sendall(self.cmd.encode('utf-8'))
-        time.sleep(self._delay)
+        self._send(self.cmd)
+        
+        self.cmd = '*OPC?\n'
+        self._send(self.cmd)
+        if self._readLine() is None:
+            print("Resetting the device failed")
+            self._measurement_configured = False
+            return -1
         
         # get device into remote mode
         self.cmd = "SYST:REM\n"
-        self.dmm_sock.sendall(self.cmd.encode('utf-8'))
-        time.sleep(self._delay)
+        self._send(self.cmd)
         
         self.cmd = "%s\n" %self.conf_measurement_dict[self._measurement_configuration]
-        self.dmm_sock.sendall(self.cmd.encode('utf-8'))
-        time.sleep(self._delay)
+        self._send(self.cmd)
         
         self._measurement_configured = True
         
@@ -274,11 +330,12 @@ class Fluke_8846A():
         
         # get current measurement configuration
         self.cmd = 'CONF?\n'
-        self.dmm_sock.sendall(self.cmd.encode('utf-8'))
-        time.sleep(self._delay)
+        self._send(self.cmd)
 
-        # read answer with buffer size of 64 bytes
-        self.ret_val = self._readSocket(int_bytes=self._bytes2read)
+        # read answer (one line)
+        self.ret_val = self._readLine()
+        if self.ret_val is None:
+            return -1
 
         # strip whitespaces and newline characters from string
         self.ret_val = self.ret_val.decode().strip()
@@ -306,11 +363,16 @@ class Fluke_8846A():
             (self._measurement_configuration == '10_CURR_AC_FREQ')):
 
             self.cmd = 'READ?; FETCH2?\n'
-            self.dmm_sock.sendall(self.cmd.encode('utf-8'))
-            time.sleep(self._delay)
+            self._send(self.cmd)
 
-            # read answer with buffer size of 64 bytes
-            self.ret_val = self._readSocket(int_bytes=self._bytes2read)
+            # read answer (one line)
+            self.ret_val = self._readLine()
+            if self.ret_val is None:
+                # no reply: write 'NULL' at the value keys (like for an empty reply)
+                for self._key in list(self._dict_dmm_measurement.keys()):
+                    if self._key.endswith('_value'):
+                        self._dict_dmm_measurement[self._key] = 'NULL'
+                return self._dict_dmm_measurement
             
             # strip whitespaces and newline characters from string and cast to float
             self.ret_val_list = self.ret_val.decode().strip().split(';')
@@ -335,13 +397,12 @@ class Fluke_8846A():
         
         else:
             self.cmd = 'READ?\n'
-            self.dmm_sock.sendall(self.cmd.encode('utf-8'))
-            time.sleep(self._delay)
-            # read answer with buffer size of 64 bytes
-            self.ret_val = self._readSocket(int_bytes=self._bytes2read)
+            self._send(self.cmd)
+            # read answer (one line, no reply is handled like an empty one)
+            self.ret_val = self._readLine()
             
             # strip whitespaces and newline characters from string and cast to float
-            self.ret_val = self.ret_val.decode().strip()
+            self.ret_val = self.ret_val.decode().strip() if self.ret_val is not None else ''
             #print(self.ret_val)
             if (self.ret_val != ''):
                 self.ret_val = float(self.ret_val)
@@ -355,3 +416,23 @@ class Fluke_8846A():
                 self._dict_dmm_measurement[self.prim_val_key] = 'NULL'
         
         return self._dict_dmm_measurement
+
+    # define an ENABLE I/O STATisticS function (latency, sleep time and bytes per SCPI command mnemonic)
+    def enableIOStats(self, enable=True):
+        if not enable:
+            self._io_stats = None
+        elif self._io_stats is None:
+            self._io_stats = SCPI_IOStats()
+
+    # define a GET I/O STATisticS function
+    def getIOStats(self):
+        if self._io_stats is None:
+            print("I/O statistics are not enabled")
+            return -1
+
+        return self._io_stats.getStatistics()
+
+    # define a RESET I/O STATisticS function
+    def resetIOStats(self):
+        if self._io_stats is not None:
+            self._io_stats.reset()
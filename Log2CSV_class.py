@@ -5,68 +5,521 @@ Created on Fr 25. Mar CET 2022
 @author: Bjoern Kasper (urmel79)
 Class for logging dataframes holding e.g. measuring data to a CSV file.
 
-To avoid premature wear of flash memory (e.g. microSD cards) by permanent writing of files, 
-the incoming data is first collected in an internal buffer dataframe and only written to 
+To avoid premature wear of flash memory (e.g. microSD cards) by permanent writing of files,
+the incoming data is first collected in an internal buffer and only written to
 the CSV file after a predefined time interval.
+
+The internal buffer is a 'SampleBuffer' (one typed NumPy array per column), preallocated with a
+capacity sized from the logging interval and the expected sample rate, so adding a row only
+copies the values into the next free slot instead of growing a dataframe.
+If the buffer runs full before the interval has elapsed, it is written out early.
+
+Optionally ('bool_async_write=True') the writing is done by a background thread fed by a
+bounded queue, so that 'log_data()' does not stall the measurement loop while the file is
+written. Call 'close()' (or use the logger as context manager) to write the remaining data;
+as a safety net this is also done automatically when the interpreter exits.
+
+The fsync policy controls when the written data is forced to the storage medium:
+    'none'     leave it to the operating system (default)
+    'interval' fsync after every write of the buffer
+    'close'    fsync only once when closing the logger
+
+Besides the tab-separated text format ('tsv', default), the data can be written in a binary
+columnar format ('npy'): a NumPy '.npy' file holding a structured array with one field per
+header column (without 'list_dtypes' all columns are float64 and values that are not numbers are
+written as NaN). Each write appends the fixed-dtype rows and then updates the row count in the
+file header, so the file is always a valid '.npy' file and can be reloaded in one go with
+'read_npy_log()' or 'np.load()'. 'convert_npy_to_tsv()' (or running this file as a script)
+produces the tab-separated layout of the text format.
+
+For long runs the log can be split into segments, rotated by size ('int_rotate_size_bytes')
+and/or wall-clock period ('int_rotate_period_sec'). Segments are named '<name>_0000.tsv',
+'<name>_0001.tsv', ... and listed together with the time range and row count of their samples
+in the manifest '<name>_manifest.tsv', which is rewritten after every chunk. The text format can
+be compressed on the fly with 'gzip' or 'zstd' (needs the package 'zstandard'): each segment is one
+compressed stream, flushed after every chunk (so all written rows can be decompressed) and finished
+when the segment is rotated or the logger is closed. pandas reads the finished files directly,
+e.g. 'pd.read_csv(file, sep="\t", compression="gzip")'.
 """
 
+import numpy as np
 import pandas as pd
-import time
+import atexit, math, os, queue, threading, time, zlib
+
+from SampleBuffer_class import SampleBuffer
+
+try:
+    import zstandard # from packet 'zstandard', only needed for compression 'zstd'
+except ImportError:
+    zstandard = None
 
 class Log2CSV():
-    def __init__(self, str_csv_file, int_log_intervall_sec, list_header):
+    FSYNC_POLICIES = ('none', 'interval', 'close')
+    FILE_FORMATS = ('tsv', 'npy')
+    COMPRESSIONS = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+    def __init__(self, str_csv_file, int_log_intervall_sec, list_header, float_sample_rate_hz=10.0, list_dtypes=None,
+                 bool_async_write=False, int_queue_size=8, str_fsync_policy='none', str_file_format='tsv',
+                 int_rotate_size_bytes=None, int_rotate_period_sec=None, str_compression=None):
+        if str_fsync_policy not in self.FSYNC_POLICIES:
+            raise ValueError("Fsync policy {} is NOT a valid one {}".format(str_fsync_policy, self.FSYNC_POLICIES))
+        if str_file_format not in self.FILE_FORMATS:
+            raise ValueError("File format {} is NOT a valid one {}".format(str_file_format, self.FILE_FORMATS))
+        if str_compression not in self.COMPRESSIONS:
+            raise ValueError("Compression {} is NOT a valid one {}".format(str_compression, list(self.COMPRESSIONS)))
+        if str_compression is not None and str_file_format != 'tsv':
+            raise ValueError("Compression is only available for the file format 'tsv'")
+        if str_compression == 'zstd' and zstandard is None:
+            raise ImportError("Compression 'zstd' needs the package 'zstandard'")
+
         self._csv_file = str_csv_file
         self._log_intervall = int_log_intervall_sec
         self._header = list_header
-        
+
         self._row = []
-        
-        self._df_log_buffer = pd.DataFrame(columns=self._header)
-        
-        # create csv file and write header
-        self._write_csv_header()
-        
+
+        self._file_format = str_file_format
+        # structured dtype and number of rows of the binary file format
+        self._npy_dtype = None
+        self._npy_header_len = 0
+        self._npy_rows = 0
+
+        # rotation and compression of the file segments
+        self._rotate_size = int_rotate_size_bytes
+        self._rotate_period = int_rotate_period_sec
+        self._rotation = (self._rotate_size is not None or self._rotate_period is not None)
+        self._compression = str_compression
+        self._zstd_compressor = zstandard.ZstdCompressor() if self._compression == 'zstd' else None
+        self._compressor = None # compression stream of the current segment
+        self._manifest_file = os.path.splitext(self._csv_file)[0] + '_manifest.tsv'
+        self._list_segments = []
+        self._segment_file = None
+        self._rotate_due = False
+
+        # capacity of the column store: all samples of one logging interval plus some headroom
+        self._buffer_capacity = max(16, int(math.ceil(self._log_intervall * float_sample_rate_hz * 1.25)) + 1)
+        self._sample_buffer = SampleBuffer(self._header, int_capacity=self._buffer_capacity)
+
+        # the dtypes of the columns are taken from 'list_dtypes' or inferred from the first row
+        self._dtypes = None
+        if list_dtypes is not None:
+            self._init_dtypes(list_dtypes)
+
+        self._fsync_policy = str_fsync_policy
+        self._closed = False
+
+        # statistics about the writes and the back-pressure of the writer queue
+        self._stats_lock = threading.Lock()
+        self._stats = { 'writes':              0,
+                        'rows_written':        0,
+                        'write_duration_last': 0.0,
+                        'write_duration_max':  0.0,
+                        'write_duration_sum':  0.0,
+                        'queue_depth_max':     0,
+                        'queue_full_count':    0,
+                        'queue_wait_sec':      0.0 }
+
+        # create (first segment of the) csv file and write header
+        self._open_segment()
+
+        # optional writer thread fed by a bounded queue
+        self._async_write = bool_async_write
+        self._write_queue = None
+        self._writer_thread = None
+        if self._async_write:
+            self._write_queue = queue.Queue(maxsize=int_queue_size)
+            self._writer_thread = threading.Thread(target=self._writer_loop, name='Log2CSV writer', daemon=True)
+            self._writer_thread.start()
+
+        # write the remaining data even if 'close()' is never called
+        atexit.register(self.close)
+
         self._time_last_write = time.time()
-    
-    # internal function to add rows to dataframe
-    def _dataframe_add_row(self, df=None, row=[]):
-        if (df is None):
-            return
 
-        # add a row
-        df.loc[-1] = row
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # internal function to set the dtypes of the columns and preallocate the buffer
+    def _init_dtypes(self, list_dtypes):
+        if len(list_dtypes) != len(self._header):
+            raise ValueError("Number of dtypes ({}) does not match number of header columns ({})"
+                             .format(len(list_dtypes), len(self._header)))
+        self._dtypes = list_dtypes
+
+        if self._file_format == 'npy':
+            try:
+                self._npy_dtype = np.dtype([(str(name), dtype) for name, dtype in zip(self._header, self._dtypes)])
+            except (TypeError, ValueError) as ex:
+                raise TypeError("Columns can NOT be stored in the binary format: {}".format(ex))
+            if self._npy_dtype.hasobject:
+                raise TypeError("The binary format needs numeric columns, please provide 'list_dtypes' without 'object'")
+
+        self._sample_buffer.set_dtypes(self._dtypes)
+
+    # internal function to add a row to the buffer
+    def _buffer_add_row(self, list_row):
+        if self._dtypes is None:
+            # the binary format needs numeric columns: all inferred columns are float64, values that are
+            # not numbers (e.g. 'NULL' for an empty reply of the DMM) are written as NaN
+            if self._file_format == 'npy':
+                self._init_dtypes([np.float64]*len(list_row))
+            else:
+                self._init_dtypes(SampleBuffer.infer_dtypes(list_row))
 
-        # shift the index
-        df.index = df.index + 1
+        self._sample_buffer.add_row(list_row)
+
+    # internal function to get the file name of a segment
+    def _segment_file_name(self, int_segment):
+        str_file = self._csv_file
+        if self._rotation:
+            str_root, str_ext = os.path.splitext(self._csv_file)
+            str_file = '{}_{:04d}{}'.format(str_root, int_segment, str_ext)
+
+        return str_file + self.COMPRESSIONS[self._compression]
+
+    # internal function to start a new segment (or the only file without rotation) and write its header
+    def _open_segment(self):
+        if self._list_segments:
+            self._finish_segment()
+
+        self._segment_file = self._segment_file_name(len(self._list_segments))
+        self._rotate_due = False
+
+        self._list_segments.append({'segment':      os.path.basename(self._segment_file),
+                                    'time_opened':  time.time(),
+                                    'time_first':   None,
+                                    'time_last':    None,
+                                    'rows':         0,
+                                    'bytes':        0})
+
+        # the header of the binary format needs the dtypes, so it is written
+        # with the first chunk, if the dtypes are inferred from the first row
+        if self._file_format == 'tsv':
+            self._write_csv_header()
+        elif self._dtypes is not None:
+            self._write_npy_header()
+        else:
+            self._npy_header_len = 0
+
+        if self._rotation:
+            self._write_manifest()
+
+    # internal function to check after writing a chunk, if the current segment is complete (a segment
+    # without rows is never rotated, the next segment is opened with the next chunk)
+    def _segment_needs_rotation(self):
+        dict_segment = self._list_segments[-1]
+        if dict_segment['rows'] == 0:
+            return False
+        if self._rotate_size is not None and dict_segment['bytes'] >= self._rotate_size:
+            return True
+        if self._rotate_period is not None:
+            return time.time() - dict_segment['time_opened'] >= self._rotate_period
+        return False
+
+    # internal function to write the manifest listing all segments with the time range of their samples
+    def _write_manifest(self):
+        try:
+            list_rows = []
+            str_dir = os.path.dirname(self._manifest_file)
+            for dict_segment in self._list_segments:
+                # segments are listed when their file is created (binary format: with the first chunk)
+                if not os.path.exists(os.path.join(str_dir, dict_segment['segment'])):
+                    continue
+                list_rows.append([dict_segment['segment']]
+                                 + [time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(dict_segment[key]))
+                                    if dict_segment[key] is not None else '' for key in ('time_first', 'time_last')]
+                                 + [dict_segment['rows'], dict_segment['bytes']])
+
+            df_manifest = pd.DataFrame(list_rows, columns=['segment', 'time_first', 'time_last', 'rows', 'bytes'])
+            df_manifest.to_csv(self._manifest_file, sep ='\t', index = False, header=True, mode='w')
+        except Exception as ex:
+            print('Writing the manifest file raised the error: "{}"'.format(ex))
+
+    # internal function to write text to the current segment (mode 'w' starts a new file and, if enabled,
+    # a new compression stream, which is flushed after the text, so all data written so far can be decompressed)
+    def _write_text(self, str_text, str_mode):
+        bytes_text = str_text.encode('utf-8')
+        if self._compression is not None:
+            if str_mode == 'w' or self._compressor is None:
+                # gzip: deflate stream with gzip header and trailer (wbits 16 + 15)
+                self._compressor = (zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if self._compression == 'gzip'
+                                    else self._zstd_compressor.compressobj())
+            if self._compression == 'gzip':
+                bytes_text = self._compressor.compress(bytes_text) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            else:
+                bytes_text = self._compressor.compress(bytes_text) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+        self._write_bytes(bytes_text, str_mode)
+
+    # internal function to write bytes to the current segment
+    def _write_bytes(self, bytes_data, str_mode):
+        with open(self._segment_file, str_mode + 'b') as file_handle:
+            file_handle.write(bytes_data)
+            if self._fsync_policy == 'interval':
+                file_handle.flush()
+                os.fsync(file_handle.fileno())
+
+    # internal function to finish the compression stream of the current segment (writes the trailer)
+    def _finish_segment(self):
+        if self._compressor is None:
+            return
+
+        try:
+            self._write_bytes(self._compressor.flush(), 'a')
+            self._list_segments[-1]['bytes'] = os.path.getsize(self._segment_file)
+        except Exception as ex:
+            print('Writing to CSV file raised the error: "{}"'.format(ex))
+        self._compressor = None
 
-        # reset the index of dataframe and avoid the old index being added as a column
-        df.reset_index(drop=True, inplace=True)
-    
     # internal function to write the csv header
     def _write_csv_header(self):
         try:
-            # write buffer to csv file in write mode (new file will be created)
-            self._df_log_buffer.to_csv(self._csv_file, sep ='\t', index = False, header=True, mode='w')
+            # write empty dataframe to csv file in write mode (new file will be created)
+            self._write_text(pd.DataFrame(columns=self._header).to_csv(None, sep ='\t', index = False, header=True), 'w')
         except Exception as ex:
             print('Writing to CSV file raised the error: "{}"'.format(ex))
-    
-    # external function to log data to buffer (dataframe)
+
+    # internal function to write the header of the binary file format (row count is updated with every chunk)
+    def _write_npy_header(self):
+        try:
+            self._npy_header_len = _write_npy_header(self._segment_file, self._npy_dtype, 0)
+            self._npy_rows = 0
+        except Exception as ex:
+            print('Writing to NPY file raised the error: "{}"'.format(ex))
+
+    # internal function to append a chunk (dataframe) to the binary file and update the row count in its header
+    def _write_npy_chunk(self, df_chunk):
+        if self._npy_header_len == 0:
+            self._write_npy_header()
+
+        arr_chunk = np.empty(len(df_chunk), dtype=self._npy_dtype)
+        for idx, name in enumerate(self._npy_dtype.names):
+            series_col = df_chunk.iloc[:, idx]
+            # column with non-numeric values (e.g. 'NULL' for a missing reading): written as NaN
+            if series_col.dtype == object:
+                series_col = pd.to_numeric(series_col, errors='coerce')
+            arr_chunk[name] = series_col.to_numpy()
+
+        with open(self._segment_file, 'r+b') as file_handle:
+            # first append the data, then update the header, so the file stays readable if writing is interrupted
+            file_handle.seek(0, os.SEEK_END)
+            file_handle.write(arr_chunk.tobytes())
+            self._npy_rows += len(arr_chunk)
+            file_handle.seek(0)
+            file_handle.write(_npy_header_bytes(self._npy_dtype, self._npy_rows, self._npy_header_len))
+            if self._fsync_policy == 'interval':
+                file_handle.flush()
+                os.fsync(file_handle.fileno())
+
+    # internal function to write a chunk (dataframe) in one bulk write to the csv file
+    def _write_chunk(self, df_chunk, time_first, time_last):
+        time_start = time.perf_counter()
+        try:
+            if self._rotate_due:
+                self._open_segment()
+
+            if self._file_format == 'npy':
+                self._write_npy_chunk(df_chunk)
+            else:
+                # write chunk to csv file in append mode (data will added to existing file)
+                self._write_text(df_chunk.to_csv(None, sep ='\t', index = False, header=False), 'a')
+
+            # keep track of the samples in the current segment
+            dict_segment = self._list_segments[-1]
+            if dict_segment['time_first'] is None:
+                dict_segment['time_first'] = time_first
+            dict_segment['time_last'] = time_last
+            dict_segment['rows'] += len(df_chunk)
+            dict_segment['bytes'] = os.path.getsize(self._segment_file)
+
+            if self._rotation:
+                self._rotate_due = self._segment_needs_rotation()
+                self._write_manifest()
+        except Exception as ex:
+            print('Writing to {} file raised the error: "{}"'.format(self._file_format.upper(), ex))
+        time_duration = time.perf_counter() - time_start
+
+        with self._stats_lock:
+            self._stats['writes'] += 1
+            self._stats['rows_written'] += len(df_chunk)
+            self._stats['write_duration_last'] = time_duration
+            self._stats['write_duration_max'] = max(self._stats['write_duration_max'], time_duration)
+            self._stats['write_duration_sum'] += time_duration
+
+    # internal function of the writer thread: write the queued chunks until the stop marker (None) arrives
+    def _writer_loop(self):
+        while True:
+            tuple_chunk = self._write_queue.get()
+            try:
+                if tuple_chunk is None:
+                    return
+                self._write_chunk(*tuple_chunk)
+            finally:
+                self._write_queue.task_done()
+
+    # internal function to write the buffer to the csv file (or hand it over to the writer thread) and reset it afterwards
+    def _flush_buffer(self):
+        if len(self._sample_buffer) > 0:
+            if self._async_write:
+                # the writer thread gets its own copy, because the preallocated columns are reused
+                df_chunk = self._sample_buffer.to_dataframe()
+                self._enqueue((df_chunk, self._time_first_row, self._time_last_row))
+            else:
+                # written at once, so the dataframe can be built on top of the columns (no copy)
+                self._write_chunk(self._sample_buffer.to_dataframe(copy=False), self._time_first_row, self._time_last_row)
+
+        # reset buffer (the preallocated columns are reused)
+        self._sample_buffer.clear()
+
+    # internal function to put a chunk into the writer queue and record the back-pressure
+    def _enqueue(self, tuple_chunk):
+        try:
+            self._write_queue.put_nowait(tuple_chunk)
+        except queue.Full:
+            # the writer thread can not keep up: block until there is space in the queue
+            time_start = time.perf_counter()
+            self._write_queue.put(tuple_chunk)
+            with self._stats_lock:
+                self._stats['queue_full_count'] += 1
+                self._stats['queue_wait_sec'] += time.perf_counter() - time_start
+
+        with self._stats_lock:
+            self._stats['queue_depth_max'] = max(self._stats['queue_depth_max'], self._write_queue.qsize())
+
+    # external function to write the buffered data immediately (waits for the writer thread in async mode)
+    def flush(self):
+        if self._closed:
+            return
+
+        self._flush_buffer()
+        if self._async_write:
+            self._write_queue.join()
+
+        self._time_last_write = time.time()
+
+    # external function to write the remaining data and stop the writer thread
+    def close(self):
+        if self._closed:
+            return
+
+        self.flush()
+        self._closed = True
+
+        if self._async_write:
+            self._write_queue.put(None)
+            self._writer_thread.join()
+
+        self._finish_segment()
+        if self._rotation:
+            self._write_manifest()
+
+        if self._fsync_policy == 'close':
+            try:
+                with open(self._segment_file, 'a') as file_handle:
+                    os.fsync(file_handle.fileno())
+            except Exception as ex:
+                print('Syncing the CSV file raised the error: "{}"'.format(ex))
+
+        atexit.unregister(self.close)
+
+    # external function to get the statistics of the writes and the writer queue
+    def get_stats(self):
+        with self._stats_lock:
+            dict_stats = dict(self._stats)
+
+        dict_stats['write_duration_mean'] = dict_stats['write_duration_sum'] / dict_stats['writes'] if dict_stats['writes'] else 0.0
+        dict_stats['queue_depth'] = self._write_queue.qsize() if self._async_write else 0
+        dict_stats['buffered_rows'] = len(self._sample_buffer)
+
+        return dict_stats
+
+    # external function to log data to buffer (column store)
     # and write to csv file from time to time
     def log_data(self, list_row):
-        # log incoming rows to buffer (dataframe)
-        self._dataframe_add_row(self._df_log_buffer, list_row)
-        
+        if self._closed:
+            raise ValueError("Logging to a closed Log2CSV object")
+
         self._time_now = time.time()
+        if len(self._sample_buffer) == 0:
+            self._time_first_row = self._time_now
+        self._time_last_row = self._time_now
+
+        # log incoming rows to buffer (column store)
+        self._buffer_add_row(list_row)
+
         self._time_delta = self._time_now - self._time_last_write
-        if (self._time_delta >= self._log_intervall):
-            try:
-                # write buffer to csv file in append mode (data will added to existing file)
-                self._df_log_buffer.to_csv(self._csv_file, sep ='\t', index = False, header=False, mode='a')
-            except Exception as ex:
-                print('Writing to CSV file raised the error: "{}"'.format(ex))
-            
-            # reset (re-initialize) buffer
-            self._df_log_buffer = pd.DataFrame(columns=self._header)
-            
+        if (self._time_delta >= self._log_intervall or len(self._sample_buffer) >= self._buffer_capacity):
+            self._flush_buffer()
+
             # save time of last write
             self._time_last_write = self._time_now
+
+####################################################
+
+# magic string and number of reserved bytes for the row count in the header of the binary file format
+_NPY_MAGIC = b'\x93NUMPY'
+_NPY_SHAPE_RESERVE = 21
+
+# internal function to build the header of a '.npy' file with a fixed length,
+# so that the row count can be updated in place when appending data
+def _npy_header_bytes(npy_dtype, int_rows, int_header_len=0):
+    str_dict = "{{'descr': {!r}, 'fortran_order': False, 'shape': ({:d},), }}".format(
+                np.lib.format.dtype_to_descr(npy_dtype), int_rows)
+    try:
+        bytes_dict = str_dict.encode('latin1')
+        bytes_version, str_len_fmt = b'\x01\x00', '<H'
+    except UnicodeEncodeError:
+        # header with non latin1 characters (e.g. in the column names) needs format version 3.0
+        bytes_dict = str_dict.encode('utf8')
+        bytes_version, str_len_fmt = b'\x03\x00', '<I'
+    int_prefix_len = len(_NPY_MAGIC) + 2 + np.dtype(str_len_fmt).itemsize
+
+    if int_header_len == 0:
+        # reserve space for the row count and align the start of the data to 64 bytes
+        int_header_len = int_prefix_len + len(bytes_dict) + _NPY_SHAPE_RESERVE + 1
+        int_header_len += -int_header_len % 64
+
+    int_dict_len = int_header_len - int_prefix_len
+    if len(bytes_dict) + 1 > int_dict_len:
+        raise ValueError("Row count does not fit into the reserved NPY header")
+    bytes_dict = bytes_dict.ljust(int_dict_len - 1) + b'\n'
+
+    return _NPY_MAGIC + bytes_version + np.array(int_dict_len, dtype=str_len_fmt).tobytes() + bytes_dict
+
+# internal function to create a new '.npy' file with an empty structured array, returns the header length
+def _write_npy_header(str_npy_file, npy_dtype, int_rows):
+    bytes_header = _npy_header_bytes(npy_dtype, int_rows)
+    with open(str_npy_file, 'wb') as file_handle:
+        file_handle.write(bytes_header)
+    return len(bytes_header)
+
+# function to read a binary log file (format 'npy') into a dataframe
+def read_npy_log(str_npy_file):
+    arr_log = np.load(str_npy_file, mmap_mode='r')
+    return pd.DataFrame({name: np.asarray(arr_log[name]) for name in arr_log.dtype.names})
+
+# function to convert a binary log file (format 'npy') to the tab-separated text format
+def convert_npy_to_tsv(str_npy_file, str_tsv_file=None):
+    if str_tsv_file is None:
+        str_tsv_file = os.path.splitext(str_npy_file)[0] + '.tsv'
+
+    read_npy_log(str_npy_file).to_csv(str_tsv_file, sep ='\t', index = False, header=True, mode='w')
+
+    return str_tsv_file
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert binary log files of Log2CSV (.npy) to tab-separated text files (.tsv)')
+    parser.add_argument('npy_files', nargs='+', help='binary log file(s) to convert')
+    parser.add_argument('-o', '--output', help='name of the TSV file (only for a single input file)')
+    args = parser.parse_args()
+
+    if args.output is not None and len(args.npy_files) > 1:
+        parser.error("option '--output' can only be used with a single input file")
+
+    for str_npy_file in args.npy_files:
+        print('{} -> {}'.format(str_npy_file, convert_npy_to_tsv(str_npy_file, args.output)))
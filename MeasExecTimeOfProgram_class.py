@@ -4,70 +4,74 @@
 Created on Sat 18. June CET 2022
 @author: Bjoern Kasper (urmel79)
 Class to measure execution time of a program
+
+The time is taken with the monotonic high resolution clock 'time.perf_counter_ns()'.
+The statistics of the samples are updated online with every added sample (mean, standard deviation,
+min, max, quartiles and a logarithmic histogram), so they need O(1) memory and time per sample.
+The first 'int_warmup_samples' samples (outliers, e.g. by the first connection) are excluded from
+the statistics. Keeping all samples in the log buffer can be switched off with 'bool_keep_samples'.
 """
 import time
-import pandas as pd
+
+from SampleBuffer_class import SampleBuffer
+from StreamingStatistics_class import StreamingStatistics
 
 class MeasExecTimeOfProgram():
-    def __init__(self):
+    def __init__(self, int_warmup_samples=1, bool_keep_samples=True):
         self._startTime = 0
         self._stopTime = 0
         self._deltaTime = 0
-        
-        self._header = ["Time samples [ms]"]
-        self._df_log_buffer = pd.DataFrame(columns=self._header)
 
-    # internal function to add rows to dataframe
-    def _dataframe_add_row(self, df=None, row=[]):
-        if (df is None):
-            return
+        self._warmup_samples = int_warmup_samples
+        self._keep_samples = bool_keep_samples
+        self._samples_cnt = 0
 
-        # add a row
-        df.loc[-1] = row
-
-        # shift the index
-        df.index = df.index + 1
+        self._header = ["Time samples [ms]"]
+        self._sample_buffer = SampleBuffer(self._header, [float])
+        self._statistics = StreamingStatistics()
 
-        # reset the index of dataframe and avoid the old index being added as a column
-        df.reset_index(drop=True, inplace=True)
-    
     # define a START function
     def start(self):
-        self._startTime = time.time()
+        self._startTime = time.perf_counter_ns()
         return 0
 
     # define a STOP function
     def stop(self):
-        self._stopTime = time.time()
+        self._stopTime = time.perf_counter_ns()
 
         self._deltaTime = self._stopTime - self._startTime
 
         # return execution time in milliseconds
-        return self._deltaTime*1000
-    
+        return self._deltaTime/1e6
+
     # define a INIT LOGGER function
     def initLogger(self):
-        self._df_log_buffer = pd.DataFrame(columns=self._header)
+        self._sample_buffer.clear()
+        self._statistics.reset()
+        self._samples_cnt = 0
         return 0
-    
+
     # define a ADD SAMPLE function
     def addSample(self, deltaTime):
-        # log incoming rows to buffer (dataframe)
-        self._dataframe_add_row(self._df_log_buffer, deltaTime)
+        self._samples_cnt += 1
+
+        # log incoming samples to buffer
+        if self._keep_samples:
+            self._sample_buffer.add_row([deltaTime])
+
+        # update statistics (except for the warm-up samples)
+        if self._samples_cnt > self._warmup_samples:
+            self._statistics.add(deltaTime)
         return 0
-        
+
     # define a GET LOG BUFFER function
     def getLogBuffer(self):
-        return self._df_log_buffer
-    
+        return self._sample_buffer.to_dataframe()
+
     # define a GET STATISTICS
     def getStatistics(self):
-        # FIRST: make a deep copy for doing statistics
-        self._df_log_buffer_copy = self._df_log_buffer.copy(deep=True)
-        
-        # drop first row of dataframe to kill outlier
-        self._df_log_buffer_copy.drop(index=self._df_log_buffer_copy.head(1).index, inplace=True)
-        # reset index of dataframe
-        self._df_log_buffer_copy.reset_index(inplace=True, drop=True)
-
-        return self._df_log_buffer_copy['Time samples [ms]'].describe()
+        return self._statistics.describe('Time samples [ms]')
+
+    # define a GET HISTOGRAM function (logarithmic buckets of the samples in milliseconds)
+    def getHistogram(self):
+        return self._statistics.histogram.getBuckets()
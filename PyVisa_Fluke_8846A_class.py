@@ -8,10 +8,17 @@ Wrapper class to communicate with the DMM Fluke 8846A via LAN interface and SCPI
 import pyvisa
 import time, sys
 
+from SCPI_Batch_class import SCPI_Batch
+from SCPI_IOStats_class import SCPI_IOStats
+
 class PyVisa_Fluke_8846A():
-    def __init__(self, tcp_ip, tcp_port):
+    def __init__(self, tcp_ip, tcp_port, io_stats=False):
         self._ip = tcp_ip
         self._port = tcp_port
+        # optional I/O statistics per SCPI command mnemonic
+        self._io_stats = SCPI_IOStats() if io_stats else None
+        # active command batch (see 'batch()')
+        self._batch = None
         self._delay = 0.05 # delay for writing the commands in seconds (50 ms)
         self._measurement_configuration = ''
         self._measurement_configured = False
@@ -56,6 +63,55 @@ class PyVisa_Fluke_8846A():
             self.connected_with = 'Nothing'
             print("Something's went wrong while opening %s:%d. Exception is %s" % (self._ip, self._port, e))
     
+    # define an internal WRITE function (records the I/O statistics, if enabled)
+    def _write(self, cmd):
+        # collect the command, if a batch is active
+        if self._batch is not None:
+            self._batch.add(cmd)
+            return
+
+        if self._io_stats is None:
+            self.dmm.write(cmd)
+            return
+
+        self._io_stats.begin(cmd, len(cmd) + len(self.dmm.write_termination or ''))
+        try:
+            self.dmm.write(cmd)
+        except Exception:
+            # record the failed transfer (e.g. timeout) before passing on the error
+            self._io_stats.abort()
+            raise
+        self._io_stats.end()
+
+    # define an internal QUERY function (records the I/O statistics, if enabled)
+    def _query(self, cmd):
+        # send the commands collected so far first
+        if self._batch is not None:
+            self._batch.flush()
+
+        if self._io_stats is None:
+            return self.dmm.query(cmd)
+
+        self._io_stats.begin(cmd, len(cmd) + len(self.dmm.write_termination or ''))
+        try:
+            ret_val = self.dmm.query(cmd)
+        except Exception:
+            # record the failed transfer (e.g. timeout) before passing on the error
+            self._io_stats.abort()
+            raise
+        self._io_stats.end(len(ret_val))
+        return ret_val
+
+    # define an internal SLEEP function (records the time spent in delays, if enabled)
+    def _sleep(self, delay):
+        # no delays between the commands of a batch
+        if self._batch is not None:
+            return
+
+        time.sleep(delay)
+        if self._io_stats is not None:
+            self._io_stats.addSleep(delay)
+
     # define a OPEN CONNECTION function
     def openConnection(self, tcp_ip, tcp_port):
         try:
@@ -106,7 +162,7 @@ class PyVisa_Fluke_8846A():
         # get current measurement configuration
         self.cmd = '*IDN?'
         
-        self.ret_val = self.dmm.query(self.cmd)
+        self.ret_val = self._query(self.cmd)
         # strip whitespaces and newline characters from string
         self.ret_val = self.ret_val.strip()
         # split string into list
@@ -128,19 +184,21 @@ class PyVisa_Fluke_8846A():
             self._measurement_configured = False
             raise TypeError("Configuration {} is NOT a valid one".format(self._measurement_configuration))
             
-        # reset device
-        self.cmd = '*RST'
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
-        
-        # get device into remote mode
-        self.cmd = "SYST:REM"
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
-        
-        self.cmd = "%s" %self.conf_measurement_dict[self._measurement_configuration]
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
+        # send all configuration commands in one program message
+        with self.batch():
+            # reset device
+            self.cmd = '*RST'
+            self._write(self.cmd)
+            self._sleep(self._delay)
+
+            # get device into remote mode
+            self.cmd = "SYST:REM"
+            self._write(self.cmd)
+            self._sleep(self._delay)
+
+            self.cmd = "%s" %self.conf_measurement_dict[self._measurement_configuration]
+            self._write(self.cmd)
+            self._sleep(self._delay)
         
         self._measurement_configured = True
         
@@ -223,7 +281,7 @@ class PyVisa_Fluke_8846A():
         # get current measurement configuration
         self.cmd = 'CONF?'
 
-        self.ret_val = self.dmm.query(self.cmd)
+        self.ret_val = self._query(self.cmd)
         # strip whitespaces and newline characters from string
         self.ret_val = self.ret_val.strip()
         
@@ -247,7 +305,7 @@ class PyVisa_Fluke_8846A():
             # # wait some time before reading data from primary and secondary display
             self.cmd = 'READ?; FETCH2?'
 
-            self.ret_val = self.dmm.query(self.cmd)
+            self.ret_val = self._query(self.cmd)
             
             # strip whitespaces and newline characters from string and cast to float
             self.ret_val_list = self.ret_val.strip().split(';')
@@ -275,7 +333,7 @@ class PyVisa_Fluke_8846A():
             # # wait some time before reading data from primary display
             self.cmd = 'READ?'
 
-            self.ret_val = self.dmm.query(self.cmd)
+            self.ret_val = self._query(self.cmd)
             
             # strip whitespaces and newline characters from string and cast to float
             self.ret_val = self.ret_val.strip()
@@ -286,3 +344,28 @@ class PyVisa_Fluke_8846A():
             self._dict_dmm_measurement[self.prim_val_key] = self.ret_val
         
         return self._dict_dmm_measurement
+
+    # define a BATCH function: collects the commands into one program message synchronized with '*OPC?'
+    # (use as context manager, errors of the error queue raise 'SCPI_BatchError' at the end)
+    def batch(self, check_errors=True):
+        return SCPI_Batch(self, check_errors)
+
+    # define an ENABLE I/O STATisticS function (latency, sleep time and bytes per SCPI command mnemonic)
+    def enableIOStats(self, enable=True):
+        if not enable:
+            self._io_stats = None
+        elif self._io_stats is None:
+            self._io_stats = SCPI_IOStats()
+
+    # define a GET I/O STATisticS function
+    def getIOStats(self):
+        if self._io_stats is None:
+            print("I/O statistics are not enabled")
+            return -1
+
+        return self._io_stats.getStatistics()
+
+    # define a RESET I/O STATisticS function
+    def resetIOStats(self):
+        if self._io_stats is not None:
+            self._io_stats.reset()
@@ -7,13 +7,33 @@ Wrapper class to communicate with the DMM Keysight 34465A via LAN interface and
 """
 import pyvisa
 import time, sys
+import numpy as np
+
+from SCPI_Batch_class import SCPI_Batch
+from SCPI_IOStats_class import SCPI_IOStats
 
 class PyVisa_Keysight_34465A():
-    def __init__(self, tcp_ip):
+    # device settings after '*RST' and after 'CONFigure' (shadow of the instrument state)
+    _RST_STATE = {'FORM:DATA': 'ASC', 'SAMP:COUN': '1', 'SAMP:SOUR': 'IMM', 'TRIG:COUN': '1', 'TRIG:SOUR': 'IMM'}
+    _CONF_STATE = {'SAMP:COUN': '1', 'SAMP:SOUR': 'IMM', 'TRIG:COUN': '1', 'TRIG:SOUR': 'IMM'}
+    # settings not touched by 'CONFigure' (the byte order 'FORM:BORD' is not in the '*RST' state,
+    # because it is kept by the device: it is sent once after every reset)
+    _CONF_PERSISTENT = ('FORM:DATA', 'FORM:BORD')
+
+    def __init__(self, tcp_ip, io_stats=False):
         self._ip = tcp_ip
+        # optional I/O statistics per SCPI command mnemonic
+        self._io_stats = SCPI_IOStats() if io_stats else None
+        # active command batch (see 'batch()')
+        self._batch = None
         self._delay = 0.01 # delay for writing the commands in seconds (10 ms)
         self._measurement_configured = False
         self._measType = "DC"
+        # shadow of the settings sent to the device, header -> value (None: state unknown, '*RST' needed)
+        self._state = None
+        # streaming: device samples with its own timer into the reading memory
+        self._streaming = False
+        self._stream_max_chunk = 50000 # max. number of readings per transfer of the reading memory
         
         self.temp_configs_dict = {  "00_PT100_2WIRE":   ("RTD",  100),         # PT100,   100 Ohm, 2-wire
                                     "01_PT100_4WIRE":   ("FRTD", 100),         # PT100,   100 Ohm, 4-wire
@@ -73,6 +93,126 @@ class PyVisa_Keysight_34465A():
             self.connected_with = 'Nothing'
             print("Pyvisa is not able to connect with the device")
     
+    # define an internal WRITE function (records the I/O statistics, if enabled)
+    def _write(self, cmd):
+        # collect the command, if a batch is active
+        if self._batch is not None:
+            self._batch.add(cmd)
+            return
+
+        if self._io_stats is None:
+            self.dmm.write(cmd)
+            return
+
+        self._io_stats.begin(cmd, len(cmd) + len(self.dmm.write_termination or ''))
+        try:
+            self.dmm.write(cmd)
+        except Exception:
+            # record the failed transfer (e.g. timeout) before passing on the error
+            self._io_stats.abort()
+            raise
+        self._io_stats.end()
+
+    # define an internal QUERY function (records the I/O statistics, if enabled)
+    def _query(self, cmd):
+        # send the commands collected so far first
+        if self._batch is not None:
+            self._batch.flush()
+
+        if self._io_stats is None:
+            return self.dmm.query(cmd)
+
+        self._io_stats.begin(cmd, len(cmd) + len(self.dmm.write_termination or ''))
+        try:
+            ret_val = self.dmm.query(cmd)
+        except Exception:
+            # record the failed transfer (e.g. timeout) before passing on the error
+            self._io_stats.abort()
+            raise
+        self._io_stats.end(len(ret_val))
+        return ret_val
+
+    # define an internal QUERY BINARY function: reads an IEEE 488.2 definite length block of
+    # 64 bit floats (big-endian, 'FORM:BORD NORM') directly into a numpy array
+    def _queryBinary(self, cmd):
+        # send the commands collected so far first
+        if self._batch is not None:
+            self._batch.flush()
+
+        if self._io_stats is None:
+            return self.dmm.query_binary_values(cmd, datatype='d', is_big_endian=True, container=np.array)
+
+        self._io_stats.begin(cmd, len(cmd) + len(self.dmm.write_termination or ''))
+        try:
+            ret_val = self.dmm.query_binary_values(cmd, datatype='d', is_big_endian=True, container=np.array)
+        except Exception:
+            # record the failed transfer (e.g. timeout) before passing on the error
+            self._io_stats.abort()
+            raise
+        self._io_stats.end(ret_val.nbytes)
+        return ret_val
+
+    # define an internal RESET DEVICE function (only if the state of the device is unknown or if forced)
+    def _resetDevice(self, reset=False):
+        if not reset and self._state is not None:
+            return
+
+        self.cmd = '*RST'
+        self._write(self.cmd)
+        self._sleep(self._delay)
+
+        self._state = dict(self._RST_STATE)
+        self._streaming = False
+
+    # define an internal SET PARAMeter function: sends 'header value' only, if the value differs
+    # from the shadow state (returns True, if the command was sent)
+    def _setParam(self, header, value):
+        value = str(value)
+        if self._state is not None and self._state.get(header) == value:
+            return False
+
+        self.cmd = '%s %s' %(header, value)
+        self._write(self.cmd)
+        self._sleep(self._delay)
+
+        if self._state is not None:
+            self._state[header] = value
+            # another function invalidates the last 'CONFigure'
+            if header == 'FUNC':
+                self._state.pop('CONF', None)
+        return True
+
+    # define an internal CONFigure function: sends 'CONF:<str_conf>' only, if the configuration differs
+    # ('CONFigure' resets the function settings, sample and trigger system, but not the data format)
+    def _configure(self, str_conf):
+        if self._state is not None and self._state.get('CONF') == str_conf:
+            return False
+
+        self.cmd = 'CONF:%s' %str_conf
+        self._write(self.cmd)
+        self._sleep(self._delay)
+
+        if self._state is not None:
+            self._state = {header: self._state[header] for header in self._CONF_PERSISTENT if header in self._state}
+            self._state.update(self._CONF_STATE)
+            self._state['CONF'] = str_conf
+        return True
+
+    # define a CLEAR STATE CACHE function (e.g. after changes at the front panel: the next
+    # configuration resets the device and sends all settings again)
+    def clearStateCache(self):
+        self._state = None
+
+    # define an internal SLEEP function (records the time spent in delays, if enabled)
+    def _sleep(self, delay):
+        # no delays between the commands of a batch
+        if self._batch is not None:
+            return
+
+        time.sleep(delay)
+        if self._io_stats is not None:
+            self._io_stats.addSleep(delay)
+
     # define a OPEN CONNECTION function
     def openConnection(self, tcp_ip):
         try:
@@ -89,6 +229,7 @@ class PyVisa_Keysight_34465A():
                     self.connected_with = '%s %s over LAN on %s' %(self.list_dev_infos[0], self.list_dev_infos[1], self._ip)
                     
             self._measurement_configured = False
+            self._state = None
             self._measType = "DC"
                     
         except pyvisa.VisaIOError:
@@ -117,7 +258,7 @@ class PyVisa_Keysight_34465A():
         
         # get current measurement configuration
         self.cmd = '*IDN?'
-        self.ret_val = self.dmm.query(self.cmd)
+        self.ret_val = self._query(self.cmd)
         # strip whitespaces and newline characters from string
         self.ret_val = self.ret_val.strip()
         # split string into list
@@ -126,7 +267,7 @@ class PyVisa_Keysight_34465A():
         return self.ret_list
     
     # define a CONFigure TEMPerature MEASUREment function
-    def confTempMeasure(self, measConf_str, ref_temp=20.0):
+    def confTempMeasure(self, measConf_str, ref_temp=20.0, reset=False):
         if (self.status != "Connected"):
             print("Device is not connected")
             self._measurement_configured = False
@@ -137,71 +278,54 @@ class PyVisa_Keysight_34465A():
             self._measurement_configured = False
             raise TypeError("Configuration {} is NOT a valid one".format(measConf_str))
 
-        # reset device
-        self.cmd = '*RST'
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
-        
-        # select temperature measurement
-        self.cmd = "FUNC 'TEMP'"
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
-        
-        # use parameters for RTD (PT100, PT1000, 2-wire or 4-wire)
-        if (self.temp_configs_dict[measConf_str][0] == 'RTD' 
-            or self.temp_configs_dict[measConf_str][0] == 'FRTD'):
-            self.cmd = "TEMP:TRAN:TYPE %s" %self.temp_configs_dict[measConf_str][0]
-            self.dmm.write(self.cmd)
-            time.sleep(self._delay)
-            
-            # configure R_0 for RTD or FRTD
-            self.cmd = "TEMP:TRAN:%s:RES %s" %(self.temp_configs_dict[measConf_str][0], self.temp_configs_dict[measConf_str][1])
-            self.dmm.write(self.cmd)
-            time.sleep(self._delay)
-        
-        # use parameters for thermocouple
-        elif self.temp_configs_dict[measConf_str][0] == 'TC':
-            # configure measurement with thermocouple probe and given type (e.g. K, J, R)
-            self.cmd = "CONF:TEMP %s,%s" %(self.temp_configs_dict[measConf_str][0], self.temp_configs_dict[measConf_str][1])
-            self.dmm.write(self.cmd)
-            time.sleep(self._delay)
-            
-            # configure reference junction temperature to internal (INT) or external (FIX)
-            self.cmd = "TEMP:TRAN:%s:RJUN:TYPE %s" %(self.temp_configs_dict[measConf_str][0], self.temp_configs_dict[measConf_str][2])
-            self.dmm.write(self.cmd)
-            time.sleep(self._delay)
-
-            # set reference junction temperature
-            if self.temp_configs_dict[measConf_str][2] == 'FIX':
-                self.cmd = "TEMP:TRAN:%s:RJUN %s" %(self.temp_configs_dict[measConf_str][0], ref_temp)
-                self.dmm.write(self.cmd)
-                time.sleep(self._delay)
-            
-        # use parameters for thermistor (NTC with 5 or 10 kOhm, 2-wire or 4-wire)
-        elif (self.temp_configs_dict[measConf_str][0] == 'THER' 
-            or self.temp_configs_dict[measConf_str][0] == 'FTH'):
-            self.cmd = "CONF:TEMP %s" %self.temp_configs_dict[measConf_str][0]
-            self.dmm.write(self.cmd)
-            time.sleep(self._delay)
-            
-            # configure R_0 for thermistor probe (NTC with 5 or 10 kOhm)
-            self.cmd = "TEMP:TRAN:%s:TYPE %s" %(self.temp_configs_dict[measConf_str][0], self.temp_configs_dict[measConf_str][1])
-            self.dmm.write(self.cmd)
-            time.sleep(self._delay)
+        # send all configuration commands in one program message
+        with self.batch():
+            # reset device (only if its state is unknown or if requested)
+            self._resetDevice(reset)
+
+            # use parameters for RTD (PT100, PT1000, 2-wire or 4-wire)
+            if (self.temp_configs_dict[measConf_str][0] == 'RTD' 
+                or self.temp_configs_dict[measConf_str][0] == 'FRTD'):
+                # select temperature measurement
+                self._setParam('FUNC', "'TEMP'")
+
+                self._setParam('TEMP:TRAN:TYPE', self.temp_configs_dict[measConf_str][0])
+
+                # configure R_0 for RTD or FRTD
+                self._setParam('TEMP:TRAN:%s:RES' %self.temp_configs_dict[measConf_str][0], self.temp_configs_dict[measConf_str][1])
+
+            # use parameters for thermocouple
+            elif self.temp_configs_dict[measConf_str][0] == 'TC':
+                # configure measurement with thermocouple probe and given type (e.g. K, J, R)
+                self._configure("TEMP %s,%s" %(self.temp_configs_dict[measConf_str][0], self.temp_configs_dict[measConf_str][1]))
+
+                # configure reference junction temperature to internal (INT) or external (FIX)
+                self._setParam('TEMP:TRAN:%s:RJUN:TYPE' %self.temp_configs_dict[measConf_str][0], self.temp_configs_dict[measConf_str][2])
+
+                # set reference junction temperature
+                if self.temp_configs_dict[measConf_str][2] == 'FIX':
+                    self._setParam('TEMP:TRAN:%s:RJUN' %self.temp_configs_dict[measConf_str][0], ref_temp)
 
-        # select unit °C to be used for all temperature measurements
-        self.cmd = 'UNIT:TEMP C'
-        self.dmm.write(self.cmd)
-        # time.sleep(self._delay)
+            # use parameters for thermistor (NTC with 5 or 10 kOhm, 2-wire or 4-wire)
+            elif (self.temp_configs_dict[measConf_str][0] == 'THER' 
+                or self.temp_configs_dict[measConf_str][0] == 'FTH'):
+                self._configure("TEMP %s" %self.temp_configs_dict[measConf_str][0])
+
+                # configure R_0 for thermistor probe (NTC with 5 or 10 kOhm)
+                self._setParam('TEMP:TRAN:%s:TYPE' %self.temp_configs_dict[measConf_str][0], self.temp_configs_dict[measConf_str][1])
+
+            # select unit °C to be used for all temperature measurements
+            self._setParam('UNIT:TEMP', 'C')
         
         self._measurement_configured = True
+        self._measType = "DC"
         
         self._dict_dmm_measurement = {}
         self._dict_dmm_measurement['temperature_value'] = 0
         self._dict_dmm_measurement['temperature_unit'] = '°C'
 
     # define a CONFigure RESistor MEASUREment function
-    def confResMeasure(self, measConf_str):
+    def confResMeasure(self, measConf_str, reset=False):
         if (self.status != "Connected"):
             print("Device is not connected")
             self._measurement_configured = False
@@ -212,23 +336,22 @@ class PyVisa_Keysight_34465A():
             self._measurement_configured = False
             raise TypeError("Configuration {} is NOT a valid one".format(measConf_str))
             
-        # reset device
-        self.cmd = '*RST'
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
-        
-        self.cmd = "CONF:%s AUTO" %self.res_configs_dict[measConf_str]
-        self.dmm.write(self.cmd)
-        # time.sleep(self._delay)
+        # send all configuration commands in one program message
+        with self.batch():
+            # reset device (only if its state is unknown or if requested)
+            self._resetDevice(reset)
+
+            self._configure("%s AUTO" %self.res_configs_dict[measConf_str])
         
         self._measurement_configured = True
+        self._measType = "DC"
         
         self._dict_dmm_measurement = {}
         self._dict_dmm_measurement['resistance_value'] = 0
         self._dict_dmm_measurement['resistance_unit'] = 'Ohm'
         
     # define a CONFigure VOLTage MEASUREment function
-    def confVoltMeasure(self, measConf_str):
+    def confVoltMeasure(self, measConf_str, reset=False):
         if (self.status != "Connected"):
             print("Device is not connected")
             self._measurement_configured = False
@@ -241,20 +364,17 @@ class PyVisa_Keysight_34465A():
             self._measType = "DC"
             raise TypeError("Configuration {} is NOT a valid one".format(measConf_str))
             
-        # reset device
-        self.cmd = '*RST'
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
-        
-        self.cmd = "CONF:VOLT:%s AUTO" %self.volt_configs_dict[measConf_str]
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
-        
-        if measConf_str == "00_AC":
-            self.cmd = "VOLT:AC:SEC 'FREQ'"
-            self.dmm.write(self.cmd)
-            # time.sleep(self._delay)
-            self._measType = "AC"
+        # send all configuration commands in one program message
+        with self.batch():
+            # reset device (only if its state is unknown or if requested)
+            self._resetDevice(reset)
+
+            self._configure("VOLT:%s AUTO" %self.volt_configs_dict[measConf_str])
+            self._measType = "DC"
+
+            if measConf_str == "00_AC":
+                self._setParam('VOLT:AC:SEC', "'FREQ'")
+                self._measType = "AC"
         
         self._measurement_configured = True
         
@@ -268,7 +388,7 @@ class PyVisa_Keysight_34465A():
             self._dict_dmm_measurement['frequency_unit'] = 'Hz'
         
     # define a CONFigure CURRent MEASUREment function
-    def confCurrMeasure(self, measConf_str):
+    def confCurrMeasure(self, measConf_str, reset=False):
         if (self.status != "Connected"):
             print("Device is not connected")
             self._measurement_configured = False
@@ -281,20 +401,17 @@ class PyVisa_Keysight_34465A():
             self._measType = "DC"
             raise TypeError("Configuration {} is NOT a valid one".format(measConf_str))
             
-        # reset device
-        self.cmd = '*RST'
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
-        
-        self.cmd = "CONF:CURR:%s AUTO" %self.curr_configs_dict[measConf_str]
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
-        
-        if measConf_str == "00_AC":
-            self.cmd = "CURR:AC:SEC 'FREQ'"
-            self.dmm.write(self.cmd)
-            # time.sleep(self._delay)
-            self._measType = "AC"
+        # send all configuration commands in one program message
+        with self.batch():
+            # reset device (only if its state is unknown or if requested)
+            self._resetDevice(reset)
+
+            self._configure("CURR:%s AUTO" %self.curr_configs_dict[measConf_str])
+            self._measType = "DC"
+
+            if measConf_str == "00_AC":
+                self._setParam('CURR:AC:SEC', "'FREQ'")
+                self._measType = "AC"
         
         self._measurement_configured = True
         
@@ -308,7 +425,7 @@ class PyVisa_Keysight_34465A():
             self._dict_dmm_measurement['frequency_unit'] = 'Hz'
         
     # define a CONFigure CAPacitancy and CONTinuity MEASUREment function
-    def confCapContMeasure(self, measConf_str):
+    def confCapContMeasure(self, measConf_str, reset=False):
         if (self.status != "Connected"):
             print("Device is not connected")
             self._measurement_configured = False
@@ -319,16 +436,15 @@ class PyVisa_Keysight_34465A():
             self._measurement_configured = False
             raise TypeError("Configuration {} is NOT a valid one".format(measConf_str))
             
-        # reset device
-        self.cmd = '*RST'
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
-        
-        self.cmd = "CONF:%s" %self.cap_cont_configs_dict[measConf_str]
-        self.dmm.write(self.cmd)
-        # time.sleep(self._delay)
+        # send all configuration commands in one program message
+        with self.batch():
+            # reset device (only if its state is unknown or if requested)
+            self._resetDevice(reset)
+
+            self._configure(self.cap_cont_configs_dict[measConf_str])
         
         self._measurement_configured = True
+        self._measType = "DC"
         
         self._dict_dmm_measurement = {}
         if measConf_str == '00_CAP':
@@ -350,7 +466,7 @@ class PyVisa_Keysight_34465A():
         
         # get current measurement configuration
         self.cmd = 'CONF?'
-        self.ret_val = self.dmm.query(self.cmd)
+        self.ret_val = self._query(self.cmd)
         
         return self.ret_val
         
@@ -363,29 +479,186 @@ class PyVisa_Keysight_34465A():
         if not self._measurement_configured:
             print("Measurement is not configured")
             return -1
+
+        if self._streaming:
+            print("Streaming is running, use stopStreaming() first")
+            return -1
             
-        # retrieve 1 measurement sample and read it back
-        self.cmd = 'SAMP:COUN 1'
-        self.dmm.write(self.cmd)
-        time.sleep(self._delay)
+        # readings are parsed as ASCII here
+        self._setParam('FORM:DATA', 'ASC')
         
-        self.cmd = 'READ?'
-        self.ret_val = self.dmm.query(self.cmd)
-        self.ret_val = float(self.ret_val)
-        #time.sleep(self._delay)
+        # retrieve 1 measurement sample and read it back
+        self._setParam('SAMP:COUN', 1)
         
         # write value at the primary value key
         self.prim_val_key = list(self._dict_dmm_measurement.keys())[0]
-        self._dict_dmm_measurement[self.prim_val_key] = self.ret_val
         
         if self._measType == "AC":
-            # retrieve data from secondary display
-            self.cmd = 'DATA2?'
-            # wait some time before reading data from secondary display
-            time.sleep(0.15)
-            self.ret_val = self.dmm.query(self.cmd)
+            # retrieve primary and secondary display in one transaction: '*OPC?' answers when the
+            # measurement started by 'INIT' is complete, so both values belong to the same measurement
+            self.cmd = 'INIT;*OPC?;:FETC?;:DATA2?'
+            self.ret_list = self._query(self.cmd).strip().split(';')
+            
+            self._dict_dmm_measurement[self.prim_val_key] = float(self.ret_list[1])
+            self._dict_dmm_measurement['frequency_value'] = float(self.ret_list[2])
+        
+        else:
+            self.cmd = 'READ?'
+            self.ret_val = self._query(self.cmd)
             self.ret_val = float(self.ret_val)
             #time.sleep(self._delay)
-            self._dict_dmm_measurement['frequency_value'] = self.ret_val
+            
+            self._dict_dmm_measurement[self.prim_val_key] = self.ret_val
 
         return self._dict_dmm_measurement
+
+    # define a GET MEASUREMENTS function: a burst of 'int_samples' readings of the primary
+    # measurement as numpy array (one binary block transfer instead of parsing each reading)
+    def getMeasurements(self, int_samples, timeout_sec=None):
+        if (self.status != "Connected"):
+            print("Device is not connected")
+            return -1
+        
+        if not self._measurement_configured:
+            print("Measurement is not configured")
+            return -1
+
+        if self._streaming:
+            print("Streaming is running, use stopStreaming() first")
+            return -1
+
+        if int_samples < 1:
+            raise ValueError("Number of samples {} is NOT a valid one (>= 1)".format(int_samples))
+
+        # transfer readings as 64 bit floats (big-endian, as decoded by '_queryBinary()')
+        self._setParam('FORM:DATA', 'REAL,64')
+        self._setParam('FORM:BORD', 'NORM')
+
+        self._setParam('SAMP:COUN', int_samples)
+
+        # a long burst may need more time than the default VISA timeout
+        timeout_ms = self.dmm.timeout
+        if timeout_sec is not None:
+            self.dmm.timeout = timeout_sec*1e3
+
+        try:
+            self.cmd = 'READ?'
+            self.ret_val = self._queryBinary(self.cmd)
+        finally:
+            self.dmm.timeout = timeout_ms
+
+        return self.ret_val
+
+    # define a START STREAMING function: the device samples every 'float_interval_sec' seconds
+    # (instrument clock) into its reading memory until 'stopStreaming()' is called
+    def startStreaming(self, float_interval_sec):
+        if (self.status != "Connected"):
+            print("Device is not connected")
+            return -1
+        
+        if not self._measurement_configured:
+            print("Measurement is not configured")
+            return -1
+
+        if self._streaming:
+            print("Streaming is already running")
+            return -1
+
+        # readings are transferred as 64 bit floats (big-endian, as decoded by '_queryBinary()')
+        self._setParam('FORM:DATA', 'REAL,64')
+        self._setParam('FORM:BORD', 'NORM')
+
+        # continuous triggers, within a trigger the samples are paced by the sample timer
+        self._setParam('TRIG:SOUR', 'IMM')
+        self._setParam('TRIG:COUN', 'INF')
+        self._setParam('SAMP:SOUR', 'TIM')
+        self._setParam('SAMP:TIM', '%g' %float_interval_sec)
+        self._setParam('SAMP:COUN', 1000000)
+
+        # clear the reading memory and start the measurement
+        self.cmd = 'INIT'
+        self._write(self.cmd)
+        self._streaming = True
+        return 0
+
+    # define a READ STREAMING function: removes all readings collected so far from the reading
+    # memory of the device and returns them as numpy array (may be empty)
+    def readStreaming(self):
+        if not self._streaming:
+            print("Streaming is not running")
+            return -1
+
+        # 'R?' returns up to the given number of readings in one block and deletes them on the device
+        self.cmd = 'R? %d' %self._stream_max_chunk
+        self.ret_val = self._queryBinary(self.cmd)
+        return self.ret_val
+
+    # define a STOP STREAMING function: aborts the measurement, restores single triggered readings
+    # and returns the readings which were still in the reading memory
+    def stopStreaming(self):
+        if not self._streaming:
+            print("Streaming is not running")
+            return -1
+
+        self.cmd = 'ABOR'
+        self._write(self.cmd)
+
+        list_chunks = []
+        while True:
+            array_chunk = self.readStreaming()
+            if len(array_chunk) == 0:
+                break
+            list_chunks.append(array_chunk)
+        self._streaming = False
+
+        self._setParam('SAMP:SOUR', 'IMM')
+        self._setParam('TRIG:COUN', 1)
+        self._setParam('SAMP:COUN', 1)
+
+        return np.concatenate(list_chunks) if list_chunks else np.empty(0)
+
+    # define a STREAM MEASUREMENTS function: generator yielding the new readings (numpy arrays) every
+    # 'float_poll_sec' seconds; the sampling rate is given by the instrument clock, not by this loop
+    # (streaming is stopped when the generator is closed, e.g. by leaving the for-loop)
+    def streamMeasurements(self, float_interval_sec, float_poll_sec=0.2):
+        if self.startStreaming(float_interval_sec) != 0:
+            return
+
+        try:
+            time_next = time.monotonic()
+            while True:
+                time_next += float_poll_sec
+                array_chunk = self.readStreaming()
+                if len(array_chunk) > 0:
+                    yield array_chunk
+
+                time.sleep(max(0.0, time_next - time.monotonic()))
+        finally:
+            # readings taken after the last yielded chunk are discarded
+            self.stopStreaming()
+
+    # define a BATCH function: collects the commands into one program message synchronized with '*OPC?'
+    # (use as context manager, errors of the error queue raise 'SCPI_BatchError' at the end; the shadow state is
+    # dropped, if the batch is discarded or reports errors, because the settings may not be applied)
+    def batch(self, check_errors=True):
+        return SCPI_Batch(self, check_errors, func_on_failure=self.clearStateCache)
+
+    # define an ENABLE I/O STATisticS function (latency, sleep time and bytes per SCPI command mnemonic)
+    def enableIOStats(self, enable=True):
+        if not enable:
+            self._io_stats = None
+        elif self._io_stats is None:
+            self._io_stats = SCPI_IOStats()
+
+    # define a GET I/O STATisticS function
+    def getIOStats(self):
+        if self._io_stats is None:
+            print("I/O statistics are not enabled")
+            return -1
+
+        return self._io_stats.getStatistics()
+
+    # define a RESET I/O STATisticS function
+    def resetIOStats(self):
+        if self._io_stats is not None:
+            self._io_stats.reset()
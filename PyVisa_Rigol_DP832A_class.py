@@ -7,10 +7,18 @@ Wrapper class to communicate with the Rigol DP832A via LAN interface and SCPI co
 """
 import pyvisa
 import time, sys
+import numpy as np
+
+from SCPI_Batch_class import SCPI_Batch
+from SCPI_IOStats_class import SCPI_IOStats
 
 class PyVisa_Rigol_DP832A():
-    def __init__(self, tcp_ip):
+    def __init__(self, tcp_ip, io_stats=False):
         self._ip = tcp_ip
+        # optional I/O statistics per SCPI command mnemonic
+        self._io_stats = SCPI_IOStats() if io_stats else None
+        # active command batch (see 'batch()')
+        self._batch = None
         self._delay = 0.01 #delay for writing the commands in seconds (10 ms)
         
         # define voltage and current limits as constants
@@ -27,6 +35,15 @@ class PyVisa_Rigol_DP832A():
 
         self.OCP_MIN         = 0.001 # min 0.001 A
         self.OCP_MAX         = 3.3   # max 3.3 A
+
+        self.TIMER_GROUPS_MAX = 2048  # max number of timer groups (points)
+        self.TIMER_TIME_MIN   = 1.0   # min 1 s dwell time per timer group
+        self.TIMER_TIME_MAX   = 99999 # max 99999 s dwell time per timer group
+        self.TIMER_CYCLES_MAX = 99999 # max number of timer cycles (finite)
+
+        # uploaded timer sequences and their start time per channel (for the progress estimation)
+        self._timer_sequences = {}
+        self._timer_started = {}
         
         try:
             if self._ip == []:
@@ -44,6 +61,55 @@ class PyVisa_Rigol_DP832A():
             self.connected_with = 'Nothing'
             print("Pyvisa is not able to connect with the device")
             
+    #define an internal WRITE function (records the I/O statistics, if enabled)
+    def _write(self, cmd):
+        # collect the command, if a batch is active
+        if self._batch is not None:
+            self._batch.add(cmd)
+            return
+
+        if self._io_stats is None:
+            self.psu.write(cmd)
+            return
+
+        self._io_stats.begin(cmd, len(cmd) + len(self.psu.write_termination or ''))
+        try:
+            self.psu.write(cmd)
+        except Exception:
+            # record the failed transfer (e.g. timeout) before passing on the error
+            self._io_stats.abort()
+            raise
+        self._io_stats.end()
+
+    #define an internal QUERY function (records the I/O statistics, if enabled)
+    def _query(self, cmd):
+        # send the commands collected so far first
+        if self._batch is not None:
+            self._batch.flush()
+
+        if self._io_stats is None:
+            return self.psu.query(cmd)
+
+        self._io_stats.begin(cmd, len(cmd) + len(self.psu.write_termination or ''))
+        try:
+            ret_val = self.psu.query(cmd)
+        except Exception:
+            # record the failed transfer (e.g. timeout) before passing on the error
+            self._io_stats.abort()
+            raise
+        self._io_stats.end(len(ret_val))
+        return ret_val
+
+    #define an internal SLEEP function (records the time spent in delays, if enabled)
+    def _sleep(self, delay):
+        # no delays between the commands of a batch
+        if self._batch is not None:
+            return
+
+        time.sleep(delay)
+        if self._io_stats is not None:
+            self._io_stats.addSleep(delay)
+
     #define a OPEN CONNECTION function
     def openConnection(self, tcp_ip):
         try:
@@ -84,8 +150,8 @@ class PyVisa_Rigol_DP832A():
         if ((chan == 1) or (chan == 2) or (chan == 3)):
             if ((state == 'ON') or (state == 'OFF')):
                 self.cmd1 = ':OUTP CH%s,%s' %(chan, state)
-                self.psu.write(self.cmd1)
-                time.sleep(self._delay)
+                self._write(self.cmd1)
+                self._sleep(self._delay)
                 return chan, state
             else:
                 print("Wrong state provided <'ON'|'OFF'>")
@@ -108,15 +174,10 @@ class PyVisa_Rigol_DP832A():
             elif (chan == 3):
                 if (voltage > self.VOLTAGE_MAX_3): voltage = self.VOLTAGE_MAX_3
 
-            self.chan_curr = self.psu.query(':INST:NSEL?')
-            if (self.chan_curr != chan):
-                self.cmd1 = ':INST:NSEL %s' %chan
-
-            self.cmd2 = ':VOLT %s' %voltage
-            self.psu.write(self.cmd1)
-            time.sleep(self._delay)
-            self.psu.write(self.cmd2)
-            time.sleep(self._delay)
+            # channel-addressed command: no need to select the channel before
+            self.cmd1 = ':SOUR%s:VOLT %s' %(chan, voltage)
+            self._write(self.cmd1)
+            self._sleep(self._delay)
             return chan, voltage
         else:
             print("Wrong channel selected <1|2|3>")
@@ -133,15 +194,10 @@ class PyVisa_Rigol_DP832A():
             if (current < self.CURRENT_MIN): current = self.CURRENT_MIN
             if (current > self.CURRENT_MAX): current = self.CURRENT_MAX
 
-            self.chan_curr = self.psu.query(':INST:NSEL?')
-            if (self.chan_curr != chan):
-                self.cmd1 = ':INST:NSEL %s' %chan
-
-            self.cmd2 = ':CURR %s' %current
-            self.psu.write(self.cmd1)
-            time.sleep(self._delay)
-            self.psu.write(self.cmd2)
-            time.sleep(self._delay)
+            # channel-addressed command: no need to select the channel before
+            self.cmd1 = ':SOUR%s:CURR %s' %(chan, current)
+            self._write(self.cmd1)
+            self._sleep(self._delay)
             return chan, current
         else:
             print("Wrong channel selected <1|2|3>")
@@ -161,15 +217,10 @@ class PyVisa_Rigol_DP832A():
             elif (chan == 3):
                 if (ovp > self.OVP_MAX_3): ovp = self.OVP_MAX_3
 
-            self.chan_curr = self.psu.query(':INST:NSEL?')
-            if (self.chan_curr != chan):
-                self.cmd1 = ':INST:NSEL %s' %chan
-
-            self.cmd2 = ':VOLT:PROT %s' %ovp
-            self.psu.write(self.cmd1)
-            time.sleep(self._delay)
-            self.psu.write(self.cmd2)
-            time.sleep(self._delay)
+            # channel-addressed command: no need to select the channel before
+            self.cmd1 = ':OUTP:OVP:VAL CH%s,%s' %(chan, ovp)
+            self._write(self.cmd1)
+            self._sleep(self._delay)
             return chan, ovp
         else:
             print("Wrong channel selected <1|2|3>")
@@ -183,15 +234,10 @@ class PyVisa_Rigol_DP832A():
 
         if ((chan == 1) or (chan == 2) or (chan == 3)):
             if ((state == 'ON') or (state == 'OFF')):
-                self.chan_curr = self.psu.query(':INST:NSEL?')
-                if (self.chan_curr != chan):
-                    self.cmd1 = ':INST:NSEL %s' %chan
-
-                self.cmd2 = ':VOLT:PROT:STAT %s' %state
-                self.psu.write(self.cmd1)
-                time.sleep(self._delay)
-                self.psu.write(self.cmd2)
-                time.sleep(self._delay)
+                # channel-addressed command: no need to select the channel before
+                self.cmd1 = ':OUTP:OVP CH%s,%s' %(chan, state)
+                self._write(self.cmd1)
+                self._sleep(self._delay)
                 return chan, state
             else:
                 print("Wrong state provided <'ON'|'OFF'>")
@@ -211,15 +257,10 @@ class PyVisa_Rigol_DP832A():
             if (ocp < self.OCP_MIN): ocp = self.OCP_MIN
             if (ocp > self.OCP_MAX): ocp = self.OCP_MAX
 
-            self.chan_curr = self.psu.query(':INST:NSEL?')
-            if (self.chan_curr != chan):
-                self.cmd1 = ':INST:NSEL %s' %chan
-
-            self.cmd2 = ':CURR:PROT %s' %ocp
-            self.psu.write(self.cmd1)
-            time.sleep(self._delay)
-            self.psu.write(self.cmd2)
-            time.sleep(self._delay)
+            # channel-addressed command: no need to select the channel before
+            self.cmd1 = ':OUTP:OCP:VAL CH%s,%s' %(chan, ocp)
+            self._write(self.cmd1)
+            self._sleep(self._delay)
             return chan, ocp
         else:
             print("Wrong channel selected <1|2|3>")
@@ -233,15 +274,10 @@ class PyVisa_Rigol_DP832A():
 
         if ((chan == 1) or (chan == 2) or (chan == 3)):
             if ((state == 'ON') or (state == 'OFF')):
-                self.chan_curr = self.psu.query(':INST:NSEL?')
-                if (self.chan_curr != chan):
-                    self.cmd1 = ':INST:NSEL %s' %chan
-
-                self.cmd2 = ':CURR:PROT:STAT %s' %state
-                self.psu.write(self.cmd1)
-                time.sleep(self._delay)
-                self.psu.write(self.cmd2)
-                time.sleep(self._delay)
+                # channel-addressed command: no need to select the channel before
+                self.cmd1 = ':OUTP:OCP CH%s,%s' %(chan, state)
+                self._write(self.cmd1)
+                self._sleep(self._delay)
                 return chan, state
             else:
                 print("Wrong state provided <'ON'|'OFF'>")
@@ -250,6 +286,46 @@ class PyVisa_Rigol_DP832A():
             print("Wrong channel selected <1|2|3>")
             return -1
 
+    #define a CONFIGURE CHANNEL function: applies the complete setup of a channel in one batched
+    #transaction (values are limited like in the single setters, 'None' leaves a setting unchanged)
+    def configureChannel(self, chan, voltage, current, ovp=None, ocp=None, ovp_state=None, ocp_state=None, output=None):
+        if (self.status != "Connected"):
+            print("Device is not connected")
+            return -1
+
+        if not ((chan == 1) or (chan == 2) or (chan == 3)):
+            print("Wrong channel selected <1|2|3>")
+            return -1
+
+        for state in (ovp_state, ocp_state, output):
+            if state not in (None, 'ON', 'OFF'):
+                print("Wrong state provided <'ON'|'OFF'>")
+                return -1
+
+        # check voltage, current, ovp and ocp limits
+        voltage_max = self.VOLTAGE_MAX_1_2 if (chan == 1) or (chan == 2) else self.VOLTAGE_MAX_3
+        ovp_max = self.OVP_MAX_1_2 if (chan == 1) or (chan == 2) else self.OVP_MAX_3
+        voltage = min(max(voltage, self.VOLTAGE_MIN), voltage_max)
+        current = min(max(current, self.CURRENT_MIN), self.CURRENT_MAX)
+        if ovp is not None: ovp = min(max(ovp, self.OVP_MIN), ovp_max)
+        if ocp is not None: ocp = min(max(ocp, self.OCP_MIN), self.OCP_MAX)
+
+        # send all channel-addressed commands in one program message
+        with self.batch():
+            self._write(':APPL CH%s,%s,%s' %(chan, voltage, current))
+            if ovp is not None:
+                self._write(':OUTP:OVP:VAL CH%s,%s' %(chan, ovp))
+            if ovp_state is not None:
+                self._write(':OUTP:OVP CH%s,%s' %(chan, ovp_state))
+            if ocp is not None:
+                self._write(':OUTP:OCP:VAL CH%s,%s' %(chan, ocp))
+            if ocp_state is not None:
+                self._write(':OUTP:OCP CH%s,%s' %(chan, ocp_state))
+            if output is not None:
+                self._write(':OUTP CH%s,%s' %(chan, output))
+
+        return chan, voltage, current
+
     #define a MEASURE VOLTAGE function
     def measVolt(self, chan):
         if (self.status != "Connected"):
@@ -258,9 +334,9 @@ class PyVisa_Rigol_DP832A():
 
         if ((chan == 1) or (chan == 2) or (chan == 3)):
             self.cmd1 = ':MEAS:VOLT? CH%s' %chan
-            self.V = self.psu.query(self.cmd1)
+            self.V = self._query(self.cmd1)
             self.V = float(self.V)
-            time.sleep(self._delay)
+            self._sleep(self._delay)
             return chan, self.V
         else:
             print("Wrong channel selected <1|2|3>")
@@ -274,9 +350,9 @@ class PyVisa_Rigol_DP832A():
 
         if ((chan == 1) or (chan == 2) or (chan == 3)):
             self.cmd1 = ':MEAS:CURR? CH%s' %chan
-            self.C = self.psu.query(self.cmd1)
+            self.C = self._query(self.cmd1)
             self.C = float(self.C)
-            time.sleep(self._delay)
+            self._sleep(self._delay)
             return chan, self.C
         else:
             print("Wrong channel selected <1|2|3>")
@@ -290,10 +366,186 @@ class PyVisa_Rigol_DP832A():
 
         if ((chan == 1) or (chan == 2) or (chan == 3)):
             self.cmd1 = ':MEAS:POWE? CH%s' %chan
-            self.P = self.psu.query(self.cmd1)
+            self.P = self._query(self.cmd1)
             self.P = float(self.P)
-            time.sleep(self._delay)
+            self._sleep(self._delay)
             return chan, self.P
         else:
             print("Wrong channel selected <1|2|3>")
             return -1
+
+    #define a MEASURE ALL function: voltage, current and power of the given channels with one query
+    #per channel (':MEAS:ALL?'); returns a numpy array [timestamp, V1, I1, P1, V2, I2, P2, ...]
+    def measAll(self, channels=(1, 2, 3)):
+        if (self.status != "Connected"):
+            print("Device is not connected")
+            return -1
+
+        for chan in channels:
+            if not ((chan == 1) or (chan == 2) or (chan == 3)):
+                print("Wrong channel selected <1|2|3>")
+                return -1
+
+        self.meas_all = np.empty(1 + 3*len(channels))
+        self.meas_all[0] = time.time()
+
+        for idx, chan in enumerate(channels):
+            self.cmd1 = ':MEAS:ALL? CH%s' %chan
+            self.meas_all[1 + 3*idx:4 + 3*idx] = [float(val) for val in self._query(self.cmd1).split(',')]
+
+        return self.meas_all
+
+    #define a MEASURE ALL HEADER function: column names matching the array of 'measAll()'
+    def measAllHeader(self, channels=(1, 2, 3)):
+        list_header = ['Timestamp [s]']
+        for chan in channels:
+            list_header += ['CH%s voltage [V]' %chan, 'CH%s current [A]' %chan, 'CH%s power [W]' %chan]
+        return list_header
+
+    #define an UPLOAD TIMER function: uploads a sequence of points (numpy array with the columns
+    #voltage [V], current [A] and dwell time [s]) to the internal timer of the channel; the timer
+    #outputs the points autonomously after 'startTimer()' ('cycles': number of repetitions or None
+    #for infinite, 'end_state': 'OFF' or 'LAST' point after the last cycle)
+    def uploadTimer(self, chan, sequence, cycles=1, end_state='OFF'):
+        if (self.status != "Connected"):
+            print("Device is not connected")
+            return -1
+
+        if not ((chan == 1) or (chan == 2) or (chan == 3)):
+            print("Wrong channel selected <1|2|3>")
+            return -1
+
+        if end_state not in ('OFF', 'LAST'):
+            print("Wrong end state provided <'OFF'|'LAST'>")
+            return -1
+
+        if cycles is not None and (int(cycles) != cycles or not 1 <= cycles <= self.TIMER_CYCLES_MAX):
+            print("Wrong number of cycles provided <1..{}|None>".format(self.TIMER_CYCLES_MAX))
+            return -1
+
+        # check the number of points against the timer groups of the device before uploading
+        sequence = np.array(sequence, dtype=float)
+        if sequence.ndim == 1 and len(sequence) == 3:
+            sequence = sequence.reshape(1, 3)
+        if sequence.ndim != 2 or sequence.shape[1] != 3:
+            print("Wrong sequence provided <points x (voltage, current, time)>")
+            return -1
+        if not 1 <= len(sequence) <= self.TIMER_GROUPS_MAX:
+            print("Wrong number of timer points <1..{}>".format(self.TIMER_GROUPS_MAX))
+            return -1
+
+        # check voltage, current and time limits
+        voltage_max = self.VOLTAGE_MAX_1_2 if (chan == 1) or (chan == 2) else self.VOLTAGE_MAX_3
+        sequence[:, 0] = np.clip(sequence[:, 0], self.VOLTAGE_MIN, voltage_max)
+        sequence[:, 1] = np.clip(sequence[:, 1], self.CURRENT_MIN, self.CURRENT_MAX)
+        sequence[:, 2] = np.clip(sequence[:, 2], self.TIMER_TIME_MIN, self.TIMER_TIME_MAX)
+
+        # the timer commands work on the selected channel, all points are sent in a few program messages
+        with self.batch():
+            self._write(':INST:NSEL %s' %chan)
+            self._write(':TIM OFF')
+            self._write(':TIM:GROU %d' %len(sequence))
+            for idx, (voltage, current, dwell) in enumerate(sequence):
+                self._write(':TIM:PARA %d,%g,%g,%g' %(idx, voltage, current, dwell))
+            if cycles is None:
+                self._write(':TIM:CYCLE I')
+            else:
+                cycles = int(cycles)
+                self._write(':TIM:CYCLE N,%d' %cycles)
+            self._write(':TIM:ENDS %s' %end_state)
+
+        self._timer_sequences[chan] = (sequence, cycles)
+        self._timer_started.pop(chan, None)
+        return chan, len(sequence)
+
+    #define a START TIMER function (switches the output of the channel on)
+    def startTimer(self, chan):
+        if (self.status != "Connected"):
+            print("Device is not connected")
+            return -1
+
+        if chan not in self._timer_sequences:
+            print("No timer sequence uploaded for channel {}".format(chan))
+            return -1
+
+        with self.batch():
+            self._write(':INST:NSEL %s' %chan)
+            self._write(':TIM ON')
+            self._write(':OUTP CH%s,ON' %chan)
+
+        self._timer_started[chan] = time.monotonic()
+        return chan, 'ON'
+
+    #define a STOP TIMER function
+    def stopTimer(self, chan):
+        if (self.status != "Connected"):
+            print("Device is not connected")
+            return -1
+
+        with self.batch():
+            self._write(':INST:NSEL %s' %chan)
+            self._write(':TIM OFF')
+
+        self._timer_started.pop(chan, None)
+        return chan, 'OFF'
+
+    #define a GET TIMER PROGRESS function: state of the timer on the device and the point which is
+    #output at the moment (estimated from the elapsed time since 'startTimer()', no query per point)
+    def getTimerProgress(self, chan):
+        if (self.status != "Connected"):
+            print("Device is not connected")
+            return -1
+
+        if chan not in self._timer_started:
+            print("Timer of channel {} is not started".format(chan))
+            return -1
+
+        sequence, cycles = self._timer_sequences[chan]
+        time_elapsed = time.monotonic() - self._timer_started[chan]
+
+        self._write(':INST:NSEL %s' %chan)
+        running = self._query(':TIM?').strip() == 'ON'
+
+        # position inside the sequence
+        time_cycle = sequence[:, 2].sum()
+        cycle = int(time_elapsed // time_cycle)
+        if cycles is not None and cycle >= cycles:
+            cycle = cycles - 1
+            point = len(sequence) - 1
+            finished = True
+        else:
+            point = int(np.searchsorted(np.cumsum(sequence[:, 2]), time_elapsed - cycle*time_cycle, side='right'))
+            point = min(point, len(sequence) - 1)
+            finished = False
+
+        return {'running': running and not finished,
+                'elapsed': time_elapsed,
+                'cycle': cycle,
+                'point': point,
+                'voltage': float(sequence[point, 0]),
+                'current': float(sequence[point, 1])}
+
+    #define a BATCH function: collects the commands into one program message synchronized with '*OPC?'
+    # (use as context manager, errors of the error queue raise 'SCPI_BatchError' at the end)
+    def batch(self, check_errors=True):
+        return SCPI_Batch(self, check_errors)
+
+    #define an ENABLE I/O STATisticS function (latency, sleep time and bytes per SCPI command mnemonic)
+    def enableIOStats(self, enable=True):
+        if not enable:
+            self._io_stats = None
+        elif self._io_stats is None:
+            self._io_stats = SCPI_IOStats()
+
+    #define a GET I/O STATisticS function
+    def getIOStats(self):
+        if self._io_stats is None:
+            print("I/O statistics are not enabled")
+            return -1
+
+        return self._io_stats.getStatistics()
+
+    #define a RESET I/O STATisticS function
+    def resetIOStats(self):
+        if self._io_stats is not None:
+            self._io_stats.reset()
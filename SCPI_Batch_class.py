@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun 18. Oct CET 2026
+@author: Bjoern Kasper (urmel79)
+Class 'SCPI_Batch' to collect the commands of a SCPI driver class into one program message.
+
+Instead of N writes (each followed by a fixed delay) the commands are joined with ';' into one
+message, which ends with '*OPC?'. The answer of '*OPC?' shows, that all commands are processed.
+With error checking the batch starts with '*CLS' (errors left in the queue before the batch are
+dropped) and the last message also queries the first entry of the error queue ('SYST:ERR?'), so
+a configuration without errors takes one LAN round trip (longer batches are split into several
+messages of max. 'int_max_length' characters, each one a round trip). Only if there are errors,
+the rest of the queue is read with further queries; all errors of the batch are raised together
+as 'SCPI_BatchError' at the end of the batch.
+
+The driver classes create a batch with their function 'batch()' and route their internal
+'_write()' into it while the batch is active:
+
+    with dmm.batch():
+        dmm.confTempMeasure('01_PT100_4WIRE')
+
+Queries inside the batch send the commands collected so far first.
+
+If the batch is discarded (exception inside the 'with' block), its transfer fails or the error
+queue reports errors, 'func_on_failure' is called, e.g. to drop a shadow of the device state that
+was updated for the collected commands.
+"""
+
+class SCPI_BatchError(Exception):
+    """A custom exception used to report the errors of the error queue after a batch"""
+
+    def __init__(self, list_errors):
+        super().__init__("SCPI error(s): %s" %'; '.join(list_errors))
+        self.list_errors = list_errors
+
+class SCPI_Batch():
+    def __init__(self, driver, check_errors=True, int_max_length=240, func_on_failure=None):
+        self._driver = driver
+        self._check_errors = check_errors
+        self._func_on_failure = func_on_failure
+        # max. length of a program message (the input buffer of the devices is limited)
+        self._max_length = int_max_length
+        self._list_commands = []
+        self.list_errors = []
+        # the error queue is cleared with the first message of the batch
+        self._clear_pending = True
+
+    # define a function to add a command to the batch
+    def add(self, cmd):
+        cmd = cmd.strip()
+        if not cmd:
+            return
+
+        # every command starts at the root of the command tree (common commands like '*RST' need no colon)
+        if not cmd.startswith('*') and not cmd.startswith(':'):
+            cmd = ':' + cmd
+        self._list_commands.append(cmd)
+
+    # define an internal function to build the program messages (each one ends with '*OPC?',
+    # the last one also queries the first entry of the error queue, if enabled)
+    def _buildMessages(self):
+        str_suffix_last = ';*OPC?;:SYST:ERR?' if self._check_errors else ';*OPC?'
+        list_messages = []
+        str_message = ''
+        for cmd in self._list_commands:
+            if str_message and len(str_message) + len(cmd) + 1 + len(str_suffix_last) > self._max_length:
+                list_messages.append(str_message + ';*OPC?')
+                str_message = ''
+            str_message = cmd if not str_message else str_message + ';' + cmd
+        list_messages.append(str_message + str_suffix_last)
+        return list_messages
+
+    # define a function to send the commands collected so far
+    # (returns the list of errors read from the error queue)
+    def flush(self):
+        if not self._list_commands:
+            return []
+
+        if self._check_errors and self._clear_pending:
+            self._list_commands.insert(0, '*CLS')
+            self._clear_pending = False
+
+        list_messages = self._buildMessages()
+        self._list_commands = []
+
+        # the driver must not route its queries into this batch while sending it
+        batch_active = self._driver._batch
+        self._driver._batch = None
+        try:
+            for str_message in list_messages:
+                str_answer = self._driver._query(str_message)
+
+            # answer of the last message: '<*OPC?>;<first entry of the error queue>'
+            list_errors = self._readErrors(str_answer.split(';', 1)[-1]) if self._check_errors else []
+        except Exception:
+            self._failed()
+            raise
+        finally:
+            self._driver._batch = batch_active
+
+        if list_errors:
+            self._failed()
+        self.list_errors.extend(list_errors)
+        return list_errors
+
+    # define an internal function to report a discarded or failed batch to the driver
+    def _failed(self):
+        if self._func_on_failure is not None:
+            self._func_on_failure()
+
+    # define an internal function to read all entries of the error queue (starting with the
+    # first entry 'str_error' already read, further entries are queried only after an error)
+    def _readErrors(self, str_error, int_max_errors=20):
+        list_errors = []
+        for idx in range(int_max_errors):
+            if idx > 0:
+                str_error = self._driver._query('SYST:ERR?')
+            str_error = str_error.strip()
+            try:
+                if int(str_error.split(',')[0]) == 0:
+                    break
+            except ValueError:
+                pass
+            list_errors.append(str_error)
+        return list_errors
+
+    # define a function to drop the commands collected so far
+    def discard(self):
+        self._list_commands = []
+
+    def __len__(self):
+        return len(self._list_commands)
+
+    def __enter__(self):
+        # nested batches are part of the outermost one (keeps the order of the commands)
+        self._batch_outer = self._driver._batch
+        if self._batch_outer is None:
+            self._driver._batch = self
+            self.list_errors = []
+            self._clear_pending = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._batch_outer is not None:
+            return
+
+        self._driver._batch = None
+        if exc_type is not None:
+            self.discard()
+            self._failed()
+            return
+
+        self.flush()
+        # errors of all messages of this batch (also the ones sent before queries)
+        if self.list_errors:
+            raise SCPI_BatchError(list(self.list_errors))
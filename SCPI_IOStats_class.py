@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun 18. Oct CET 2026
+@author: Bjoern Kasper (urmel79)
+Class 'SCPI_IOStats' to record the I/O statistics of the SCPI driver classes per command mnemonic.
+
+For every command mnemonic (e.g. 'READ?', 'CONF:VOLT:DC', '*IDN?') the following is recorded:
+    - wire latency: time from sending the command until it is written (or the reply has been read),
+      without the time spent in our own sleeps in between
+    - sleep time: time spent in the fixed delays of the driver after/while processing the command
+    - bytes transferred in both directions
+    - failed transfers (timeouts, I/O errors) with the time spent until the error
+The wire latencies are kept as streaming statistics with a logarithmic histogram (O(1) memory).
+"""
+
+import re, time
+import pandas as pd
+
+from StreamingStatistics_class import StreamingStatistics
+
+class SCPI_IOStats():
+    # parameters (everything after the first whitespace) are not part of the mnemonic
+    _RE_PARAMETERS = re.compile(r'\s.*$')
+
+    def __init__(self):
+        self.reset()
+
+    # define a function to reset all statistics
+    def reset(self):
+        self._dict_stats = {}
+        self._last_mnemonic = None
+        self._pending = None
+
+    # define a function to extract the mnemonic of a command: header without parameters, e.g.
+    # 'CONF:TEMP TC,K' -> 'CONF:TEMP', 'READ?; FETCH2?' -> 'READ?;FETCH2?'
+    @classmethod
+    def mnemonic(cls, str_cmd):
+        list_headers = [cls._RE_PARAMETERS.sub('', part.strip()).upper() for part in str_cmd.strip().split(';')]
+        return ';'.join(header for header in list_headers if header)
+
+    # internal function to get (or create) the statistics of a mnemonic
+    def _getEntry(self, str_mnemonic):
+        dict_entry = self._dict_stats.get(str_mnemonic)
+        if dict_entry is None:
+            dict_entry = self._dict_stats[str_mnemonic] = {'wire': StreamingStatistics(),
+                                                           'sleep_sec': 0.0,
+                                                           'bytes_tx': 0,
+                                                           'bytes_rx': 0,
+                                                           'failed': 0,
+                                                           'failed_sec': 0.0}
+        return dict_entry
+
+    # define a function to mark the start of a command transfer
+    def begin(self, str_cmd, int_bytes_tx=0, str_mnemonic=None):
+        # a transfer not finished with 'end()' or 'abort()' is recorded as failed
+        if self._pending is not None:
+            self.abort()
+
+        if str_mnemonic is None:
+            str_mnemonic = self.mnemonic(str_cmd)
+        self._pending = [str_mnemonic, time.perf_counter(), int_bytes_tx, 0.0]
+
+    # define a function to mark the end of the transfer started with 'begin()'
+    def end(self, int_bytes_rx=0):
+        if self._pending is None:
+            return
+
+        str_mnemonic, time_start, int_bytes_tx, float_slept = self._pending
+        self._pending = None
+
+        dict_entry = self._getEntry(str_mnemonic)
+        dict_entry['wire'].add(max(0.0, time.perf_counter() - time_start - float_slept))
+        dict_entry['sleep_sec'] += float_slept
+        dict_entry['bytes_tx'] += int_bytes_tx
+        dict_entry['bytes_rx'] += int_bytes_rx
+        self._last_mnemonic = str_mnemonic
+
+    # define a function to mark the transfer started with 'begin()' as failed (e.g. timeout of the reply):
+    # its time is recorded separately, so the wire latencies contain only complete transfers
+    def abort(self):
+        if self._pending is None:
+            return
+
+        str_mnemonic, time_start, int_bytes_tx, float_slept = self._pending
+        self._pending = None
+
+        dict_entry = self._getEntry(str_mnemonic)
+        dict_entry['failed'] += 1
+        dict_entry['failed_sec'] += max(0.0, time.perf_counter() - time_start - float_slept)
+        dict_entry['sleep_sec'] += float_slept
+        dict_entry['bytes_tx'] += int_bytes_tx
+        self._last_mnemonic = str_mnemonic
+
+    # define a function to record the time spent in a sleep of the driver
+    # (counted for the pending command or else for the last command)
+    def addSleep(self, float_sleep_sec):
+        if self._pending is not None:
+            self._pending[3] += float_sleep_sec
+        elif self._last_mnemonic is not None:
+            self._getEntry(self._last_mnemonic)['sleep_sec'] += float_sleep_sec
+
+    # define a function to get the statistics per mnemonic as dataframe (times in milliseconds)
+    def getStatistics(self):
+        list_rows = []
+        for str_mnemonic in sorted(self._dict_stats):
+            dict_entry = self._dict_stats[str_mnemonic]
+            stats_wire = dict_entry['wire']
+            list_rows.append([str_mnemonic,
+                              stats_wire.count,
+                              stats_wire.running.mean*1e3,
+                              stats_wire.quantiles[0.5].value*1e3,
+                              stats_wire.running.max*1e3,
+                              stats_wire.running.mean*stats_wire.count*1e3,
+                              dict_entry['sleep_sec']*1e3,
+                              dict_entry['bytes_tx'],
+                              dict_entry['bytes_rx'],
+                              dict_entry['failed'],
+                              dict_entry['failed_sec']*1e3])
+
+        return pd.DataFrame(list_rows, columns=['mnemonic', 'count', 'wire mean [ms]', 'wire median [ms]', 'wire max [ms]',
+                                                'wire total [ms]', 'sleep total [ms]', 'bytes tx', 'bytes rx',
+                                                'failed', 'failed total [ms]']).set_index('mnemonic')
+
+    # define a function to get the histogram of the wire latencies (in seconds) of a mnemonic
+    def getHistogram(self, str_mnemonic):
+        return self._dict_stats[str_mnemonic]['wire'].histogram.getBuckets()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun 18. Oct CET 2026
+@author: Bjoern Kasper (urmel79)
+Class 'SampleBuffer': growable buffer for measuring data with typed columns.
+
+Each column is stored in its own NumPy array. When the buffer runs full, the capacity is doubled,
+so adding a row costs O(1) on average, no matter how long a measurement runs (in contrast to
+adding rows to a dataframe one at a time, which copies the whole dataframe on every row).
+Rows can also be dropped at the front in O(1), e.g. for a scrolling live plot.
+
+The filled part of a column is returned by 'to_numpy()' as a view (no copy), which is only valid
+until the next row is added. 'to_dataframe()' returns an independent dataframe (copy of the rows);
+with 'copy=False' the dataframe is built on top of the views instead.
+"""
+
+import numpy as np
+import pandas as pd
+
+class SampleBuffer():
+    def __init__(self, list_header, list_dtypes=None, int_capacity=64):
+        self._header = list(list_header)
+        self._capacity = max(1, int(int_capacity))
+        self._dict_col_idx = {name: idx for idx, name in enumerate(self._header)}
+
+        # filled part of the buffer: rows [self._start, self._stop) of every column
+        self._start = 0
+        self._stop = 0
+
+        # the dtypes of the columns are taken from 'list_dtypes' or inferred from the first row
+        self._dtypes = None
+        self._columns = None
+        if list_dtypes is not None:
+            self.set_dtypes(list_dtypes)
+
+    def __len__(self):
+        return self._stop - self._start
+
+    # function to infer column dtypes from a row: integers are stored as int64, other numbers as float64,
+    # everything else as object
+    @staticmethod
+    def infer_dtypes(list_row):
+        list_dtypes = []
+        for val in list_row:
+            if isinstance(val, (bool, np.bool_)):
+                list_dtypes.append(object)
+            elif isinstance(val, (int, np.integer)):
+                list_dtypes.append(np.int64)
+            elif isinstance(val, (float, np.floating)):
+                list_dtypes.append(np.float64)
+            else:
+                list_dtypes.append(object)
+
+        return list_dtypes
+
+    @property
+    def header(self):
+        return self._header
+
+    @property
+    def dtypes(self):
+        return self._dtypes
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    # function to set the column dtypes and allocate the columns (only possible as long as the buffer is empty)
+    def set_dtypes(self, list_dtypes):
+        if len(self) > 0:
+            raise ValueError("Dtypes can only be set as long as the buffer is empty")
+        if len(list_dtypes) != len(self._header):
+            raise ValueError("Number of dtypes ({}) does not match number of header columns ({})"
+                             .format(len(list_dtypes), len(self._header)))
+
+        self._dtypes = [np.dtype(dtype) for dtype in list_dtypes]
+        self._columns = [np.empty(self._capacity, dtype=dtype) for dtype in self._dtypes]
+        self._start = 0
+        self._stop = 0
+
+    # internal function to make room for one more row: move the rows to the front or double the capacity
+    def _make_room(self):
+        int_rows = len(self)
+        if int_rows >= self._capacity // 2:
+            self._capacity *= 2
+
+        list_columns = []
+        for col in self._columns:
+            col_new = np.empty(self._capacity, dtype=col.dtype) if len(col) != self._capacity else col
+            col_new[:int_rows] = col[self._start:self._stop]
+            list_columns.append(col_new)
+
+        self._columns = list_columns
+        self._start = 0
+        self._stop = int_rows
+
+    # internal function to change the dtype of a column for a value it can not hold:
+    # integer columns become float64 for other numbers, else the column becomes object
+    def _promote_column(self, int_idx, val):
+        if (self._dtypes[int_idx].kind in 'iu' and isinstance(val, (int, float, np.number))
+                and not isinstance(val, (bool, np.bool_))):
+            dtype_new = np.dtype(np.float64)
+        else:
+            dtype_new = np.dtype(object)
+
+        self._dtypes[int_idx] = dtype_new
+        self._columns[int_idx] = self._columns[int_idx].astype(dtype_new)
+        return self._columns[int_idx]
+
+    # function to add a row (list with one value per column)
+    # (a value that does not fit into the dtype of its column changes the dtype, see '_promote_column()')
+    def add_row(self, list_row):
+        if self._columns is None:
+            self.set_dtypes(self.infer_dtypes(list_row))
+
+        if len(list_row) != len(self._columns):
+            raise ValueError("Row has {} values, but the header has {} columns".format(len(list_row), len(self._columns)))
+
+        if self._stop >= self._capacity:
+            self._make_room()
+
+        for idx, (col, val) in enumerate(zip(self._columns, list_row)):
+            try:
+                col[self._stop] = val
+            except (TypeError, ValueError, OverflowError):
+                col = self._promote_column(idx, val)
+                col[self._stop] = val
+                continue
+
+            # integer columns would silently truncate other numbers (e.g. 1.5 -> 1)
+            if col.dtype.kind in 'iu' and not isinstance(val, (int, np.integer)):
+                col = self._promote_column(idx, val)
+                col[self._stop] = val
+
+        self._stop += 1
+
+    # function to drop the first (oldest) rows
+    def drop_first(self, int_rows=1):
+        self._start = min(self._start + max(0, int(int_rows)), self._stop)
+        if self._start == self._stop:
+            self._start = self._stop = 0
+
+    # function to remove all rows (the allocated capacity is kept)
+    def clear(self):
+        self._start = 0
+        self._stop = 0
+
+    # function to get the filled part of a column (by name or index) as NumPy array without copying;
+    # without a column a tuple with the views of all columns is returned
+    def to_numpy(self, column=None):
+        if self._columns is None:
+            arr_empty = np.empty(0, dtype=np.float64)
+            return arr_empty if column is not None else tuple(arr_empty for _ in self._header)
+
+        if column is None:
+            return tuple(col[self._start:self._stop] for col in self._columns)
+
+        int_idx = self._dict_col_idx[column] if column in self._dict_col_idx else int(column)
+        return self._columns[int_idx][self._start:self._stop]
+
+    # function to get the filled part of the buffer as dataframe (with 'copy=False' built on top of the
+    # column views: no copy, but only valid until the buffer is changed)
+    def to_dataframe(self, copy=True):
+        if self._columns is None:
+            return pd.DataFrame(columns=self._header)
+
+        df_buffer = pd.DataFrame({idx: col for idx, col in enumerate(self.to_numpy())}, copy=copy)
+        df_buffer.columns = self._header
+
+        return df_buffer
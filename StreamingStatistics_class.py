@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun 18. Oct CET 2026
+@author: Bjoern Kasper (urmel79)
+Classes for online (streaming) statistics of measuring values, e.g. execution times.
+
+All classes need O(1) memory and O(1) time per sample, so they can run for any number of samples:
+    'RunningStatistics'    count, mean, variance/standard deviation (Welford), min and max
+    'P2Quantile'           estimation of one quantile with the P² algorithm (Jain and Chlamtac, 1985)
+    'LogHistogram'         histogram with logarithmic buckets (a fixed number of buckets per decade)
+    'StreamingStatistics'  combination of the above with a 'describe()' like pandas
+"""
+
+import math
+import pandas as pd
+
+class RunningStatistics():
+    def __init__(self):
+        self.reset()
+
+    # function to reset all statistics
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.nan
+        self.max = math.nan
+
+    # function to add a sample (Welford's online algorithm for mean and variance)
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if self.count == 1:
+            self.min = value
+            self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+
+    # sample variance (like pandas with ddof=1)
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance) if self.count > 1 else math.nan
+
+####################################################
+
+class P2Quantile():
+    def __init__(self, quantile):
+        if not 0.0 < quantile < 1.0:
+            raise ValueError("Quantile {} is NOT a valid one (0 < quantile < 1)".format(quantile))
+
+        self._p = quantile
+        self.reset()
+
+    # function to reset the estimator
+    def reset(self):
+        self.count = 0
+        # heights, actual positions, desired positions and increments of the desired positions of the 5 markers
+        self._q = []
+        self._n = [0, 1, 2, 3, 4]
+        self._n_desired = [0.0, 2*self._p, 4*self._p, 2 + 2*self._p, 4.0]
+        self._dn = [0.0, self._p/2, self._p, (1 + self._p)/2, 1.0]
+
+    # function to add a sample
+    def add(self, value):
+        self.count += 1
+
+        # the first 5 samples initialize the markers
+        if self.count <= 5:
+            self._q.append(value)
+            self._q.sort()
+            return
+
+        q = self._q
+        n = self._n
+
+        # find the cell k with q[k] <= value < q[k+1] and adjust the extreme markers
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= q[k+1]:
+                k += 1
+
+        for i in range(k+1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._n_desired[i] += self._dn[i]
+
+        # adjust the heights of the three middle markers, if necessary
+        for i in range(1, 4):
+            d = self._n_desired[i] - n[i]
+            if (d >= 1 and n[i+1] - n[i] > 1) or (d <= -1 and n[i-1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+
+                # piecewise parabolic prediction of the new height
+                q_new = q[i] + d / (n[i+1] - n[i-1]) * ((n[i] - n[i-1] + d) * (q[i+1] - q[i]) / (n[i+1] - n[i])
+                                                         + (n[i+1] - n[i] - d) * (q[i] - q[i-1]) / (n[i] - n[i-1]))
+                if not q[i-1] < q_new < q[i+1]:
+                    # use linear prediction, if the parabolic one is out of order
+                    q_new = q[i] + d * (q[i+d] - q[i]) / (n[i+d] - n[i])
+
+                q[i] = q_new
+                n[i] += d
+
+    # estimated quantile (exact with linear interpolation as long as there are only up to 5 samples)
+    @property
+    def value(self):
+        if self.count == 0:
+            return math.nan
+        if self.count <= 5:
+            pos = self._p * (self.count - 1)
+            idx = int(pos)
+            if idx + 1 >= self.count:
+                return self._q[idx]
+            return self._q[idx] + (pos - idx) * (self._q[idx+1] - self._q[idx])
+
+        return self._q[2]
+
+####################################################
+
+class LogHistogram():
+    def __init__(self, int_buckets_per_decade=10):
+        self._buckets_per_decade = int_buckets_per_decade
+        self.reset()
+
+    # function to reset the histogram
+    def reset(self):
+        self.count = 0
+        # values <= 0 can not be sorted into a logarithmic bucket
+        self.count_nonpositive = 0
+        self._dict_buckets = {}
+
+    # function to add a sample to its bucket [10^(i/n), 10^((i+1)/n))
+    def add(self, value):
+        self.count += 1
+
+        if value <= 0:
+            self.count_nonpositive += 1
+            return
+
+        idx = math.floor(math.log10(value) * self._buckets_per_decade)
+        self._dict_buckets[idx] = self._dict_buckets.get(idx, 0) + 1
+
+    # function to get the buckets as dataframe with the columns 'lower', 'upper' and 'count'
+    def getBuckets(self):
+        list_rows = [(10**(idx/self._buckets_per_decade), 10**((idx+1)/self._buckets_per_decade), self._dict_buckets[idx])
+                     for idx in sorted(self._dict_buckets)]
+
+        return pd.DataFrame(list_rows, columns=['lower', 'upper', 'count'])
+
+####################################################
+
+class StreamingStatistics():
+    QUANTILES = (0.25, 0.5, 0.75)
+
+    def __init__(self, int_buckets_per_decade=10, tuple_quantiles=QUANTILES):
+        self.running = RunningStatistics()
+        self.quantiles = {p: P2Quantile(p) for p in tuple_quantiles}
+        self.histogram = LogHistogram(int_buckets_per_decade)
+
+    # function to reset all statistics
+    def reset(self):
+        self.running.reset()
+        for estimator in self.quantiles.values():
+            estimator.reset()
+        self.histogram.reset()
+
+    # function to add a sample to all statistics
+    def add(self, value):
+        self.running.add(value)
+        for estimator in self.quantiles.values():
+            estimator.add(value)
+        self.histogram.add(value)
+
+    @property
+    def count(self):
+        return self.running.count
+
+    # function to get the statistics as series in the layout of 'pd.Series.describe()'
+    def describe(self, str_name=None):
+        dict_stats = {'count': self.running.count, 'mean': self.running.mean if self.running.count else math.nan,
+                      'std': self.running.std, 'min': self.running.min}
+        for p, estimator in self.quantiles.items():
+            dict_stats['{:g}%'.format(p*100)] = estimator.value
+        dict_stats['max'] = self.running.max
+
+        return pd.Series(dict_stats, name=str_name, dtype=float)
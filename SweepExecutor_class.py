@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun 18. Oct CET 2026
+@author: Bjoern Kasper (urmel79)
+Class 'SweepExecutor' for coordinated source/measure sweeps, e.g. a power supply Rigol DP832A as
+source and the DMMs Keysight 34465A or Fluke 8846A for measuring.
+
+Instead of a fixed delay sized for the worst case, the executor moves on to the next setpoint as
+soon as the readings have settled: the slope of a straight line fitted to the last 'k' readings
+and the noise band (peak-to-peak of the residuals of this line) must be within the given limits.
+The next setpoint is applied right after settling. The results of the finished point are
+calculated and handed to 'func_result' (e.g. writing to a file) by a worker thread, so this
+runs while the next point settles; the results are kept in the order of the setpoints.
+
+Source and measurements are given as functions, so any driver can be used:
+
+    sweep = SweepExecutor(lambda volt: psu.setVoltage(2, volt),
+                          {'PSU voltage [V]': lambda: psu.measVolt(2)[1],
+                           'DMM voltage [V]': lambda: dmm.getMeasurement()['voltage_value']},
+                          int_settle_samples=5, float_slope_max=0.05, float_noise_max=0.02)
+    df_results = sweep.run(np.arange(0, 20, 2))
+"""
+
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from SampleBuffer_class import SampleBuffer
+
+class SweepExecutor():
+    def __init__(self, func_set_point, dict_meas_funcs, int_settle_samples=5, float_slope_max=0.01,
+                 float_noise_max=0.01, float_sample_interval_sec=0.1, float_settle_timeout_sec=30.0,
+                 str_settle_channel=None, func_result=None):
+        if len(dict_meas_funcs) == 0:
+            raise ValueError("At least one measuring function is needed")
+        if int_settle_samples < 2:
+            raise ValueError("Number of settle samples {} is NOT a valid one (>= 2)".format(int_settle_samples))
+
+        self._set_point = func_set_point
+        self._dict_meas_funcs = dict(dict_meas_funcs)
+        self._list_names = list(self._dict_meas_funcs)
+
+        # settle criterion: slope [unit/s] and noise band [unit] of the last 'int_settle_samples' readings
+        self._settle_samples = int_settle_samples
+        self._slope_max = float_slope_max
+        self._noise_max = float_noise_max
+        self._sample_interval = float_sample_interval_sec
+        self._settle_timeout = float_settle_timeout_sec
+        self._settle_channel = str_settle_channel if str_settle_channel is not None else self._list_names[0]
+        if self._settle_channel not in self._dict_meas_funcs:
+            raise ValueError("Settle channel {} is NOT a valid one".format(self._settle_channel))
+
+        # optional function called with every result row, e.g. 'Log2CSV.log_data'
+        self._func_result = func_result
+
+        self._header = ['Setpoint', 'Settle time [s]', 'Settled', 'Samples']
+        for name in self._list_names:
+            self._header += ['%s mean' %name, '%s std' %name]
+        self._results = SampleBuffer(self._header, [np.float64]*len(self._header))
+
+    # define a function to check the settle criterion for the readings 'array_values' taken at 'array_time'
+    @staticmethod
+    def isSettled(array_time, array_values, float_slope_max, float_noise_max):
+        # least squares fit of a straight line
+        time_mean = array_time.mean()
+        value_mean = array_values.mean()
+        time_centered = array_time - time_mean
+        denominator = (time_centered**2).sum()
+        slope = (time_centered*(array_values - value_mean)).sum() / denominator if denominator > 0 else 0.0
+
+        residuals = array_values - value_mean - slope*time_centered
+        return abs(slope) <= float_slope_max and residuals.max() - residuals.min() <= float_noise_max
+
+    # define an internal function to read all measuring functions once
+    def _readAll(self):
+        return [float(self._dict_meas_funcs[name]()) for name in self._list_names]
+
+    # define an internal function to measure until the readings have settled (or the timeout is reached)
+    # returns the readings of the last 'int_settle_samples' samples, the settle time and the settled flag
+    def _waitSettled(self, time_set):
+        idx_settle = self._list_names.index(self._settle_channel)
+        array_time = np.empty(self._settle_samples)
+        array_values = np.empty((self._settle_samples, len(self._list_names)))
+        int_samples = 0
+
+        time_next = time.perf_counter()
+        while True:
+            time_sample = time.perf_counter()
+            array_time[int_samples % self._settle_samples] = time_sample
+            array_values[int_samples % self._settle_samples] = self._readAll()
+            int_samples += 1
+
+            if int_samples >= self._settle_samples:
+                if self.isSettled(array_time, array_values[:, idx_settle], self._slope_max, self._noise_max):
+                    return array_values, time_sample - time_set, True, int_samples
+                if time_sample - time_set >= self._settle_timeout:
+                    return array_values, time_sample - time_set, False, int_samples
+
+            time_next += self._sample_interval
+            time.sleep(max(0.0, time_next - time.perf_counter()))
+
+    # define an internal function to write the results of a finished point
+    def _addResult(self, setpoint, array_values, float_settle_time, bool_settled, int_samples):
+        list_row = [setpoint, float_settle_time, float(bool_settled), int_samples]
+        for idx in range(len(self._list_names)):
+            # sample standard deviation ('int_settle_samples' >= 2 readings)
+            list_row += [array_values[:, idx].mean(), array_values[:, idx].std(ddof=1)]
+
+        self._results.add_row(list_row)
+        if self._func_result is not None:
+            self._func_result(list_row)
+
+    # define a RUN function: applies all setpoints one after the other and returns the result table
+    def run(self, setpoints):
+        list_setpoints = list(setpoints)
+        if not list_setpoints:
+            return self.getResults()
+
+        self._set_point(list_setpoints[0])
+        time_set = time.perf_counter()
+
+        # one worker thread writes the results (in order) while the next point settles
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future_result = None
+            for idx, setpoint in enumerate(list_setpoints):
+                array_values, float_settle_time, bool_settled, int_samples = self._waitSettled(time_set)
+
+                if idx + 1 < len(list_setpoints):
+                    self._set_point(list_setpoints[idx + 1])
+                    time_set = time.perf_counter()
+
+                # errors of the former point (e.g. in 'func_result') stop the sweep
+                if future_result is not None:
+                    future_result.result()
+                future_result = executor.submit(self._addResult, setpoint, array_values.copy(),
+                                                float_settle_time, bool_settled, int_samples)
+
+            future_result.result()
+
+        return self.getResults()
+
+    # define a GET RESULTS function: one row per setpoint as dataframe
+    def getResults(self):
+        return self._results.to_dataframe()
+
+    # define a CLEAR RESULTS function
+    def clearResults(self):
+        self._results.clear()
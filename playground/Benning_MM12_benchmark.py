@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark for the class 'Benning_MM12_Serial': compares the decoded display frames per second of
+the table-driven 'struct' decoder with the former decoder (hex string slicing, 'int(..., 16)' per
+field and an if/elif chain for the range multiplier).
+
+Usage (from the repository root, needs pyserial for importing the class):
+    python playground/Benning_MM12_benchmark.py [--frames 100000]
+"""
+
+import argparse, os, random, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from Benning_MM12_class import Benning_MM12_Serial
+
+# former implementation of the decoder (SI base units) working on the hex string of the frame
+def former_decode(frame):
+    hex_bytes = frame.hex()
+    if int(hex_bytes[0:8], 16) != 0x5555010C:
+        return {}
+
+    func_code_int = int(hex_bytes[8:10], 16) & 0b01111111
+    list_func_unit = Benning_MM12_Serial.dict_function_codes_units[func_code_int]
+    range_code_int = int(hex_bytes[10:12], 16) & 0b01111111
+
+    if func_code_int == 0x05:
+        range_float = Benning_MM12_Serial.list_range_multiplier_ohm[range_code_int]
+    elif func_code_int in (0x0D, 0x0E):
+        range_float = Benning_MM12_Serial.list_range_multiplier_temp[range_code_int]
+    elif func_code_int in (0x01, 0x19, 0x27, 0x02, 0x15):
+        range_float = Benning_MM12_Serial.list_range_multiplier_voltage[range_code_int]
+    elif func_code_int in (0x03, 0x1A, 0x28, 0x04, 0x16):
+        range_float = Benning_MM12_Serial.list_range_multiplier_millivoltage[range_code_int]
+    elif func_code_int in (0x09, 0x0A, 0x17, 0x1B, 0x29):
+        range_float = Benning_MM12_Serial.list_range_multiplier_current[range_code_int]
+    elif func_code_int in (0x0B, 0x0C, 0x18, 0x1C, 0x2A):
+        range_float = Benning_MM12_Serial.list_range_multiplier_millicurrent[range_code_int]
+    else:
+        range_float = Benning_MM12_Serial.list_range_multiplier_NONE[range_code_int]
+
+    disp_value = int.from_bytes(bytes.fromhex(hex_bytes[12:18]), 'little', signed=False)
+
+    return {'function': list_func_unit[0], 'value': disp_value*range_float, 'unit': list_func_unit[1]}
+
+def make_frames(int_frames):
+    # DC V, AC V, Ohm, DC mA and °C frames with valid range codes
+    list_codes = [(0x02, 0x01), (0x01, 0x83), (0x05, 0x02), (0x0C, 0x00), (0x0D, 0x00)]
+    list_frames = []
+    for _ in range(int_frames):
+        func_code, range_code = random.choice(list_codes)
+        payload = bytes([func_code, range_code]) + random.randrange(1 << 24).to_bytes(3, 'little') + bytes([0x09]) + bytes(6)
+        list_frames.append(bytes.fromhex('55 55 01 0C') + payload + bytes([(0x62 + sum(payload)) & 0xFF]))
+    return list_frames
+
+def bench(func_decode, list_frames):
+    time_start = time.perf_counter()
+    for frame in list_frames:
+        func_decode(frame)
+    return time.perf_counter() - time_start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=100000, help='number of frames to decode')
+    args = parser.parse_args()
+
+    list_frames = make_frames(args.frames)
+    assert all(former_decode(frame) == Benning_MM12_Serial.decodeBaseUnits(frame) for frame in list_frames[:1000])
+
+    time_former = bench(former_decode, list_frames)
+    time_table = bench(Benning_MM12_Serial.decodeBaseUnits, list_frames)
+
+    print('{:d} frames'.format(args.frames))
+    print('former decoder:        {:12.0f} frames/s'.format(args.frames/time_former))
+    print('table-driven decoder:  {:12.0f} frames/s'.format(args.frames/time_table))
+    print('speed-up:              {:12.1f} x'.format(time_former/time_table))
+
+if __name__ == '__main__':
+    main()
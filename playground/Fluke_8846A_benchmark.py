@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark for the class 'Fluke_8846A': compares the readings per second of the buffered line
+reader with the former reader (5 ms delay after each command, 'recv()' of 40 bytes with a
+10 ms timeout and 0.3 s retries).
+
+A local stand-in server answers the SCPI queries like the DMM, optionally after a measuring
+time ('--meas-time') and split into several TCP segments ('--fragments').
+
+Usage (from the repository root):
+    python playground/Fluke_8846A_benchmark.py [--readings 50] [--meas-time 0.02] [--fragments 2]
+"""
+
+import argparse, os, socket, sys, threading, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from Fluke_8846A_class import Fluke_8846A
+
+DICT_REPLIES = {'*IDN?':            'FLUKE,8846A,1234567,08/02/10-11:53',
+                '*OPC?':            '1',
+                'CONF?':            '"VOLT +1.000000E+01,+1.000000E-06"',
+                'READ?':            '+2.31475628E+00',
+                'READ?; FETCH2?':   '+2.31475628E+00;+5.00012345E+01'}
+
+# stand-in for the DMM: answers one query per line
+def serve_dmm(server_sock, float_meas_time, int_fragments):
+    conn, _ = server_sock.accept()
+    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    buffer = b''
+    with conn:
+        while True:
+            data = conn.recv(4096)
+            if not data:
+                return
+            buffer += data
+            while b'\n' in buffer:
+                line, buffer = buffer.split(b'\n', 1)
+                str_cmd = line.decode().strip()
+                if str_cmd not in DICT_REPLIES:
+                    continue
+
+                if str_cmd.startswith('READ?'):
+                    time.sleep(float_meas_time)
+
+                reply = (DICT_REPLIES[str_cmd] + '\r\n').encode()
+                int_step = max(1, -(-len(reply) // int_fragments))
+                for idx in range(0, len(reply), int_step):
+                    conn.sendall(reply[idx:idx + int_step])
+                    time.sleep(0.001)
+
+def start_server(float_meas_time, int_fragments):
+    server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_sock.bind(('127.0.0.1', 0))
+    server_sock.listen(1)
+    threading.Thread(target=serve_dmm, args=(server_sock, float_meas_time, int_fragments), daemon=True).start()
+    return server_sock, server_sock.getsockname()[1]
+
+# former implementation of the reader
+def former_read(sock, str_cmd):
+    sock.sendall(str_cmd.encode('utf-8'))
+    time.sleep(0.005)
+
+    sock.settimeout(0.01)
+    for _ in range(11):
+        try:
+            ret_val = sock.recv(40)
+        except socket.timeout:
+            time.sleep(0.3)
+            continue
+        return ret_val
+    return -1
+
+def bench_former(int_readings, float_meas_time, int_fragments):
+    server_sock, int_port = start_server(float_meas_time, int_fragments)
+    sock = socket.create_connection(('127.0.0.1', int_port))
+
+    time_start = time.perf_counter()
+    int_valid = 0
+    for _ in range(int_readings):
+        ret_val = former_read(sock, 'READ?\n')
+        try:
+            float(ret_val.decode().strip())
+            int_valid += 1
+        except (AttributeError, ValueError):
+            pass
+    time_duration = time.perf_counter() - time_start
+
+    sock.close()
+    server_sock.close()
+    return time_duration, int_valid
+
+def bench_line_reader(int_readings, float_meas_time, int_fragments):
+    server_sock, int_port = start_server(float_meas_time, int_fragments)
+    dmm = Fluke_8846A(tcp_ip='127.0.0.1', tcp_port=int_port)
+    dmm.confMeasurement('08_VOLT_DC')
+
+    time_start = time.perf_counter()
+    int_valid = 0
+    for _ in range(int_readings):
+        if isinstance(dmm.getMeasurement()['voltage_value'], float):
+            int_valid += 1
+    time_duration = time.perf_counter() - time_start
+
+    dmm.closeConnection()
+    server_sock.close()
+    return time_duration, int_valid
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readings', type=int, default=50, help='number of readings')
+    parser.add_argument('--meas-time', type=float, default=0.02, help='measuring time of the stand-in DMM in [s]')
+    parser.add_argument('--fragments', type=int, default=2, help='number of TCP segments per reply')
+    args = parser.parse_args()
+
+    time_former, int_valid_former = bench_former(args.readings, args.meas_time, args.fragments)
+    time_line, int_valid_line = bench_line_reader(args.readings, args.meas_time, args.fragments)
+
+    print('{:d} readings, measuring time {:.1f} ms, {:d} segments per reply'.format(args.readings, args.meas_time*1e3, args.fragments))
+    print('former reader:   {:8.1f} readings/s ({:d} valid)'.format(args.readings/time_former, int_valid_former))
+    print('line reader:     {:8.1f} readings/s ({:d} valid)'.format(args.readings/time_line, int_valid_line))
+    print('speed-up:        {:8.1f} x'.format(time_former/time_line))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark for the class 'Log2CSV': compares the appends per second of the column store
+buffer with the former row-by-row dataframe buffer ('_dataframe_add_row').
+
+Usage (from the repository root):
+    python playground/Log2CSV_benchmark.py [--rows 5000] [--cols 8]
+"""
+
+import argparse, os, sys, tempfile, time
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from Log2CSV_class import Log2CSV
+
+# former implementation of the buffer: add rows to a dataframe one at a time
+def dataframe_add_row(df=None, row=[]):
+    if (df is None):
+        return
+
+    # add a row
+    df.loc[-1] = row
+
+    # shift the index
+    df.index = df.index + 1
+
+    # reset the index of dataframe and avoid the old index being added as a column
+    df.reset_index(drop=True, inplace=True)
+
+def bench_dataframe(list_header, list_rows):
+    df = pd.DataFrame(columns=list_header)
+
+    time_start = time.perf_counter()
+    for row in list_rows:
+        dataframe_add_row(df, row)
+    return time.perf_counter() - time_start
+
+def bench_column_store(list_header, list_rows, str_csv_file):
+    # a long logging interval, so that only the appends are measured
+    logger = Log2CSV(str_csv_file, 3600, list_header, float_sample_rate_hz=len(list_rows)/3600)
+
+    time_start = time.perf_counter()
+    for row in list_rows:
+        logger.log_data(row)
+    time_duration = time.perf_counter() - time_start
+
+    logger.close()
+    return time_duration
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000, help='number of rows to append')
+    parser.add_argument('--cols', type=int, default=8, help='number of columns per row')
+    args = parser.parse_args()
+
+    list_header = ['Time [s]'] + ['Sensor {} [°C]'.format(i) for i in range(1, args.cols)]
+    list_rows = [[0.5*i] + [20.0 + 0.01*i + j for j in range(1, args.cols)] for i in range(args.rows)]
+
+    with tempfile.TemporaryDirectory() as str_tmp_dir:
+        time_df = bench_dataframe(list_header, list_rows)
+        time_cs = bench_column_store(list_header, list_rows, os.path.join(str_tmp_dir, 'bench.tsv'))
+
+    print('{:d} rows x {:d} columns'.format(args.rows, args.cols))
+    print('dataframe buffer:    {:12.0f} appends/s'.format(args.rows/time_df))
+    print('column store buffer: {:12.0f} appends/s'.format(args.rows/time_cs))
+    print('speed-up:            {:12.1f} x'.format(time_df/time_cs))
+
+if __name__ == '__main__':
+    main()
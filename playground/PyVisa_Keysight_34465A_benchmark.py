@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark for the class 'PyVisa_Keysight_34465A': compares the readings per second of single
+ASCII readings ('getMeasurement()') with bursts transferred as binary block ('getMeasurements()').
+
+Needs a Keysight 34465A in the network (DC voltage is measured with the default settings).
+
+Usage (from the repository root):
+    python playground/PyVisa_Keysight_34465A_benchmark.py <ip> [--readings 100] [--burst 100]
+"""
+
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from PyVisa_Keysight_34465A_class import PyVisa_Keysight_34465A
+
+def bench_single(dmm, int_readings):
+    time_start = time.perf_counter()
+    for _ in range(int_readings):
+        dmm.getMeasurement()
+    return time.perf_counter() - time_start
+
+def bench_burst(dmm, int_readings, int_burst):
+    int_done = 0
+    time_start = time.perf_counter()
+    while int_done < int_readings:
+        int_done += len(dmm.getMeasurements(min(int_burst, int_readings - int_done), timeout_sec=30))
+    return time.perf_counter() - time_start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('ip', help='IP address of the DMM')
+    parser.add_argument('--readings', type=int, default=100, help='number of readings')
+    parser.add_argument('--burst', type=int, default=100, help='number of readings per burst')
+    args = parser.parse_args()
+
+    dmm = PyVisa_Keysight_34465A(tcp_ip=args.ip)
+    if dmm.status != "Connected":
+        sys.exit(1)
+    print(dmm.connected_with)
+
+    dmm.confVoltMeasure('01_DC')
+    time_single = bench_single(dmm, args.readings)
+    time_burst = bench_burst(dmm, args.readings, args.burst)
+    dmm.closeConnection()
+
+    print('{:d} readings, {:d} readings per burst'.format(args.readings, args.burst))
+    print('single ASCII readings: {:10.1f} readings/s'.format(args.readings/time_single))
+    print('binary bursts:         {:10.1f} readings/s'.format(args.readings/time_burst))
+    print('speed-up:              {:10.1f} x'.format(time_single/time_burst))
+
+if __name__ == '__main__':
+    main()
@@ -3,31 +3,179 @@
 """
 Created on Mo 07. Feb CET 2022
 Helper classes for measuring code execution times
+
+A 'Timer' can be used with '.start()'/'.stop()', as context manager or as decorator:
+
+    with Timer('loop/getMeasurement', logger=None):
+        dmm.getMeasurement()
+
+    @timed('log_data')
+    def log_data(row): ...
+
+Named timers report their elapsed times to a process-wide registry ('timers'), which aggregates
+per-name statistics ('timers.getStatistics()'). Named timers running inside other named timers
+(in the same thread) are recorded hierarchically as 'outer/inner'.
+With 'disable()' all timers become no-ops with nearly no overhead, so they can stay in production code.
 """
 
-import time
+import functools, threading, time
+import pandas as pd
+
+from StreamingStatistics_class import StreamingStatistics
 
 class TimerError(Exception):
     """A custom exception used to report errors in use of Timer class"""
 
-class Timer:
+class TimerRegistry:
+    """Thread-safe collection of the statistics of elapsed times (in seconds) per timer name"""
+
     def __init__(self):
+        self._lock = threading.Lock()
+        self._dict_stats = {}
+
+    def add(self, name, elapsed_time):
+        """Add an elapsed time to the statistics of a timer name"""
+
+        with self._lock:
+            stats = self._dict_stats.get(name)
+            if stats is None:
+                stats = self._dict_stats[name] = StreamingStatistics()
+            stats.add(elapsed_time)
+
+    def reset(self):
+        """Remove all statistics"""
+
+        with self._lock:
+            self._dict_stats.clear()
+
+    @property
+    def names(self):
+        with self._lock:
+            return sorted(self._dict_stats)
+
+    def getStatistics(self):
+        """Return the statistics of all timer names as dataframe (one row per name, times in seconds)"""
+
+        with self._lock:
+            list_series = []
+            for name in sorted(self._dict_stats):
+                series_stats = self._dict_stats[name].describe(name)
+                series_stats['total'] = series_stats['mean'] * series_stats['count']
+                list_series.append(series_stats)
+
+        if not list_series:
+            return pd.DataFrame(columns=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max', 'total'])
+        return pd.DataFrame(list_series)
+
+    def getHistogram(self, name):
+        """Return the logarithmic histogram of the elapsed times of a timer name"""
+
+        with self._lock:
+            return self._dict_stats[name].histogram.getBuckets()
+
+# process-wide registry of the named timers
+timers = TimerRegistry()
+
+# global switch and per-thread stack of the running named timers (for hierarchical names)
+_state = threading.local()
+_enabled = True
+
+def enable():
+    """Enable all timers"""
+    global _enabled
+    _enabled = True
+
+def disable():
+    """Disable all timers (start/stop, context managers and decorators become no-ops)"""
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def _span_stack():
+    stack = getattr(_state, 'stack', None)
+    if stack is None:
+        stack = _state.stack = []
+    return stack
+
+class Timer:
+    def __init__(self, name=None, text="Elapsed time: {:0.4f} seconds", logger=print, registry=timers):
+        self.name = name
+        self.text = text
+        self.logger = logger
+        self.registry = registry
+        self.full_name = name
         self._start_time = None
+        self._start_skipped = False
 
     def start(self):
         """Start a new timer"""
 
+        if not _enabled:
+            # the matching 'stop()' is a no-op, even if the timers are enabled in between
+            self._start_skipped = True
+            return
+
         if self._start_time is not None:
             raise TimerError(f"Timer is running. Use .stop() to stop it")
 
+        self._start_skipped = False
+
+        if self.name is not None:
+            stack = _span_stack()
+            self.full_name = stack[-1] + '/' + self.name if stack else self.name
+            stack.append(self.full_name)
+
         self._start_time = time.perf_counter()
 
     def stop(self):
         """Stop the timer, and report the elapsed time"""
 
+        if self._start_skipped:
+            self._start_skipped = False
+            return None
+
+        if not _enabled and self._start_time is None:
+            return None
+
         if self._start_time is None:
             raise TimerError(f"Timer is not running. Use .start() to start it")
 
         elapsed_time = time.perf_counter() - self._start_time
         self._start_time = None
-        print(f"Elapsed time: {elapsed_time:0.4f} seconds")
+
+        if self.name is not None:
+            stack = _span_stack()
+            if stack and stack[-1] == self.full_name:
+                stack.pop()
+            self.registry.add(self.full_name, elapsed_time)
+
+        if self.logger:
+            self.logger(self.text.format(elapsed_time))
+
+        return elapsed_time
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __call__(self, func):
+        """Use the timer as decorator (every call gets its own timer, so recursion is allowed)"""
+
+        @functools.wraps(func)
+        def wrapper_timer(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            with Timer(self.name, self.text, self.logger, self.registry):
+                return func(*args, **kwargs)
+
+        return wrapper_timer
+
+def timed(name):
+    """Return a silent named timer, e.g. for instrumenting hot paths as context manager or decorator"""
+    return Timer(name=name, logger=None)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the column store of 'Log2CSV' ('SampleBuffer') with rows of mixed types
+"""
+
+import os, sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from Log2CSV_class import Log2CSV, read_npy_log
+from SampleBuffer_class import SampleBuffer
+
+LIST_HEADER = ['Sample', 'Voltage [V]', 'Sensor ID']
+LIST_ROWS = [[0, 1.25, '28-01'],
+             [1, 'NULL', '28-01'],  # empty reply of the DMM
+             [2, 1.5, None],
+             [3, float('nan'), '28-02']]
+
+def test_sample_buffer_mixed_types():
+    buffer = SampleBuffer(LIST_HEADER)
+    for list_row in LIST_ROWS:
+        buffer.add_row(list_row)
+
+    assert [dtype.kind for dtype in buffer.dtypes] == ['i', 'O', 'O']
+    assert buffer.to_numpy('Sample').tolist() == [0, 1, 2, 3]
+    assert buffer.to_numpy('Voltage [V]')[1] == 'NULL'
+
+def test_sample_buffer_int_column_takes_floats():
+    buffer = SampleBuffer(['Counter'])
+    buffer.add_row([1])
+    buffer.add_row([1.5])
+
+    assert buffer.dtypes[0] == np.float64
+    assert buffer.to_numpy('Counter').tolist() == [1.0, 1.5]
+
+def test_log_data_mixed_types_tsv(tmp_path):
+    str_file = str(tmp_path / 'log.tsv')
+    with Log2CSV(str_file, 3600, LIST_HEADER) as logger:
+        for list_row in LIST_ROWS:
+            logger.log_data(list_row)
+
+    list_lines = open(str_file).read().splitlines()
+    assert list_lines[0] == '\t'.join(LIST_HEADER)
+    assert list_lines[1] == '0\t1.25\t28-01'
+    assert list_lines[2] == '1\tNULL\t28-01'
+    assert len(list_lines) == 1 + len(LIST_ROWS)
+
+def test_log_data_mixed_types_npy(tmp_path):
+    str_file = str(tmp_path / 'log.npy')
+    with Log2CSV(str_file, 3600, LIST_HEADER[:2], str_file_format='npy') as logger:
+        for list_row in LIST_ROWS:
+            logger.log_data(list_row[:2])
+
+    df_log = read_npy_log(str_file)
+    assert df_log['Sample'].tolist() == [0, 1, 2, 3]
+    assert df_log['Voltage [V]'].iloc[0] == 1.25
+    assert pd.isna(df_log['Voltage [V]'].iloc[1])
+
+def test_log_data_npy_first_row_not_numeric(tmp_path):
+    str_file = str(tmp_path / 'log.npy')
+    with Log2CSV(str_file, 3600, LIST_HEADER[:2], str_file_format='npy') as logger:
+        logger.log_data([0, 'NULL'])
+        logger.log_data([1, 1.5])
+
+    df_log = read_npy_log(str_file)
+    assert df_log['Sample'].tolist() == [0, 1]
+    assert pd.isna(df_log['Voltage [V]'].iloc[0])
+    assert df_log['Voltage [V]'].iloc[1] == 1.5